@@ -8,6 +8,24 @@ Lightweight SOAP Python client providing a Web Service proxy.
 # Project properties
 #
 
+from asyncsuds.version import __build__, __version__
+
+__all__ = [
+    "__build__",
+    "__version__",
+    "BuildError",
+    "MethodNotFound",
+    "PortNotFound",
+    "Repr",
+    "ServiceNotFound",
+    "TypeNotFound",
+    "WebFault",
+    "byte_str",
+    "byte_str_class",
+    "null",
+    "objid",
+    "tostr",
+]
 
 #
 # Exceptions
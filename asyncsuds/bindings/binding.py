@@ -3,6 +3,7 @@
 
 """
 
+from contextvars import ContextVar
 from copy import deepcopy
 
 from asyncsuds import *
@@ -20,6 +21,9 @@ from asyncsuds.xsd.sxbasic import Element as SchemaElement
 
 envns = ("SOAP-ENV", "http://schemas.xmlsoap.org/soap/envelope/")
 
+# The options of the client building a message, see Binding.get_message().
+_invoking = ContextVar("invoking", default=None)
+
 
 class Binding(object):
     """
@@ -32,6 +36,8 @@ class Binding(object):
     @type schema: L{xsd.schema.Schema}
     @ivar options: A dictionary options.
     @type options: L{Options}
+    @ivar plans: The compiled method plans, keyed by method.
+    @type plans: {I{service.Method}: L{Plan}}
 
     """
 
@@ -43,12 +49,25 @@ class Binding(object):
         """
         self.wsdl = wsdl
         self.multiref = MultiRef()
+        self.plans = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["plans"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.plans = {}
 
     def schema(self):
         return self.wsdl.schema
 
     def options(self):
-        return self.wsdl.options
+        options = _invoking.get()
+        if options is None:
+            return self.wsdl.options
+        return options
 
     def unmarshaller(self):
         """
@@ -70,6 +89,23 @@ class Binding(object):
         """
         return MxLiteral(self.schema(), self.options().xstq)
 
+    def plan(self, method):
+        """
+        Get the compiled plan for the specified I{method}, created the first
+        time the method is used.
+
+        @param method: A service method.
+        @type method: I{service.Method}
+        @return: The method plan.
+        @rtype: L{Plan}
+
+        """
+        plan = self.plans.get(method)
+        if plan is None:
+            plan = Plan()
+            self.plans[method] = plan
+        return plan
+
     def param_defs(self, method):
         """
         Get parameter definitions.
@@ -84,22 +120,34 @@ class Binding(object):
         """
         raise Exception("not implemented")
 
-    def get_message(self, method, args, kwargs):
+    def get_message(self, method, args, kwargs, options=None):
         """
         Get a SOAP message for the specified method, args and SOAP headers.
 
         This is the entry point for creating an outbound SOAP message.
 
+        WSDL objects may be shared by clients with different options (e.g.
+        I{wsse} credentials), so the invoking client passes its own options
+        used instead of those the WSDL got loaded with.
+
         @param method: The method being invoked.
         @type method: I{service.Method}
         @param args: A list of args for the method invoked.
         @type args: list
         @param kwargs: Named (keyword) args for the method invoked.
         @type kwargs: dict
+        @param options: The options of the invoking client.
+        @type options: L{Options}
         @return: The SOAP envelope.
         @rtype: L{Document}
 
         """
+        if options is not None:
+            token = _invoking.set(options)
+            try:
+                return self.get_message(method, args, kwargs)
+            finally:
+                _invoking.reset(token)
         content = self.headercontent(method)
         header = self.header(content)
         content = self.bodycontent(method, args, kwargs)
@@ -144,6 +192,19 @@ class Binding(object):
             resolved = rtypes[0].resolve(nobuiltin=True)
             return self.unmarshaller().process(nodes[0], resolved)
 
+    def replyparser(self, method):
+        """
+        Get a parser unmarshalling the I{reply} for the specified I{method}
+        directly while parsing it.
+
+        @param method: The invoked method.
+        @type method: I{service.Method}
+        @return: A reply parser, or None when not supported by the binding.
+        @rtype: L{stream.ReplyParser}
+
+        """
+        return None
+
     def replylist(self, rt, nodes):
         """
         Construct a I{list} reply.
@@ -221,7 +282,7 @@ class Binding(object):
         @rtype: L{Element}
 
         """
-        marshaller = self.marshaller()
+        marshaller = self.plan(method).marshaller(self)
         content = Content(
             tag=pdef[0], value=object, type=pdef[1], real=pdef[1].resolve()
         )
@@ -242,7 +303,7 @@ class Binding(object):
         @rtype: L{Element}
 
         """
-        marshaller = self.marshaller()
+        marshaller = self.plan(method).marshaller(self)
         if isinstance(object, (list, tuple)):
             return [self.mkheader(method, hdef, item) for item in object]
         content = Content(tag=hdef[0], value=object, type=hdef[1])
@@ -384,11 +445,9 @@ class Binding(object):
         @rtype: [I{pdef},...]
 
         """
-        if input:
-            parts = method.soap.input.body.parts
-        else:
-            parts = method.soap.output.body.parts
-        return [self.__part_type(p, input) for p in parts]
+        return self.plan(method).get(
+            ("body", input), self.__bodypart_types, method, input
+        )
 
     def headpart_types(self, method, input=True):
         """
@@ -406,11 +465,9 @@ class Binding(object):
         @rtype: [I{pdef},...]
 
         """
-        if input:
-            headers = method.soap.input.headers
-        else:
-            headers = method.soap.output.headers
-        return [self.__part_type(h.part, input) for h in headers]
+        return self.plan(method).get(
+            ("header", input), self.__headpart_types, method, input
+        )
 
     def returned_types(self, method):
         """
@@ -424,6 +481,20 @@ class Binding(object):
         """
         return self.bodypart_types(method, input=False)
 
+    def __bodypart_types(self, method, input):
+        if input:
+            parts = method.soap.input.body.parts
+        else:
+            parts = method.soap.output.body.parts
+        return [self.__part_type(p, input) for p in parts]
+
+    def __headpart_types(self, method, input):
+        if input:
+            headers = method.soap.input.headers
+        else:
+            headers = method.soap.output.headers
+        return [self.__part_type(h.part, input) for h in headers]
+
     def __part_type(self, part, input):
         """
         Get a I{parameter definition} (pdef) defined for a given body or header
@@ -456,6 +527,57 @@ class Binding(object):
         return part_type.name, part_type
 
 
+class Plan(object):
+    """
+    The compiled plan of a service method.
+
+    Everything derived from the WSDL and its schema alone, e.g. the method
+    parameter definitions and their types, is computed the first time the
+    method is used and reused by all later calls, leaving them to only fill
+    in the values.
+
+    @ivar compiled: The compiled definitions, keyed by name.
+    @type compiled: dict
+
+    """
+
+    def __init__(self):
+        self.compiled = {}
+
+    def get(self, key, build, *args):
+        """
+        Get a compiled definition, building it on first use.
+
+        @param key: The definition key.
+        @type key: any
+        @param build: The function building the definition.
+        @type build: callable
+        @param args: The I{build} arguments.
+        @return: The compiled definition.
+        @rtype: any
+
+        """
+        try:
+            return self.compiled[key]
+        except KeyError:
+            value = build(*args)
+            self.compiled[key] = value
+            return value
+
+    def marshaller(self, binding):
+        """
+        Get the marshaller reused by all the method calls, so the type
+        information it looks up and caches is reused as well.
+
+        @param binding: The binding marshalling the method parameters.
+        @type binding: L{Binding}
+        @return: The marshaller.
+        @rtype: L{MxLiteral}
+
+        """
+        return self.get(("marshaller", binding.options().xstq), binding.marshaller)
+
+
 class PartElement(SchemaElement):
     """
     A part used to represent a message part when the part references a schema
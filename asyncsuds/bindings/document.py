@@ -90,6 +90,11 @@ class Document(Binding):
             return body[0].children
         return body.children
 
+    def replyparser(self, method):
+        from asyncsuds.bindings.stream import ReplyParser
+
+        return ReplyParser(self, method)
+
     def document(self, wrapper):
         """
         Get the document root. For I{document/literal}, this is the name of the
@@ -118,13 +123,19 @@ class Document(Binding):
 
     def param_defs(self, method):
         """Get parameter definitions for document literal."""
+        return self.plan(method).get("params", self.__param_defs, method)
+
+    def returned_types(self, method):
+        return self.plan(method).get("returned", self.__returned_types, method)
+
+    def __param_defs(self, method):
         pts = self.bodypart_types(method)
         if not method.soap.input.body.wrapped:
             return pts
         pt = pts[0][1].resolve()
         return [(c.name, c, a) for c, a in pt if not c.isattr()]
 
-    def returned_types(self, method):
+    def __returned_types(self, method):
         rts = super(Document, self).returned_types(method)
         if not method.soap.output.body.wrapped:
             return rts
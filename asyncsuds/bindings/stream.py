@@ -0,0 +1,201 @@
+"""
+Classes for unmarshalling I{document/literal} replies while parsing them.
+"""
+
+from xml.parsers import expat
+
+from asyncsuds.bindings.binding import envns
+from asyncsuds.bindings.multiref import MultiRef
+from asyncsuds.sax.parser import ExpatBuilder
+from asyncsuds.sudsobject import Factory
+from asyncsuds.umx.stream import Stream
+from asyncsuds.umx.stream import Unsupported
+
+
+class ReplyParser(ExpatBuilder):
+    """
+    Parses a I{document/literal} SOAP reply and unmarshals its content
+    directly from the parser events, without building the reply XML tree.
+
+    The result is the same as the one returned by L{Binding.get_reply()}.
+    Replies needing the complete tree, i.e. faults, multiref replies and
+    mixed content, are detected while parsing and reported by L{close()}
+    raising L{Unsupported}. So are malformed replies, leaving the error
+    reporting to the regular reply processing.
+
+    @ivar rtypes: The method return types.
+    @type rtypes: [L{xsd.sxbase.SchemaObject},...]
+    @ivar wrapped: Whether the reply parts are wrapped in a single document.
+    @type wrapped: bool
+    @ivar depth: The depth of the reply content nodes.
+    @type depth: int
+    @ivar result: The unmarshalled reply.
+    @type result: L{Object}|list
+
+    """
+
+    def __init__(self, binding, method):
+        """
+        @param binding: The binding the reply is processed for.
+        @type binding: L{Binding}
+        @param method: The invoked method.
+        @type method: I{service.Method}
+
+        """
+        ExpatBuilder.__init__(self)
+        self.rtypes = binding.returned_types(method)
+        self.wrapped = method.soap.output.body.wrapped
+        self.depth = 3 if self.wrapped else 2
+        self.unmarshaller = Stream(binding.schema())
+        self.multi = len(self.rtypes) == 1 and self.rtypes[0].multi_occurrence()
+        if len(self.rtypes) > 1:
+            self.result = Factory.object("reply")
+        elif self.multi:
+            self.result = []
+        else:
+            self.result = None
+        self.body = None
+        self.wrapper = None
+        self.current = None
+        self.done = False
+        self.error = None
+        self.empty = True
+
+    def feed(self, data):
+        if self.error is not None or not data:
+            return
+        self.empty = False
+        try:
+            ExpatBuilder.feed(self, data)
+        except Unsupported as e:
+            self.error = e
+        except expat.ExpatError as e:
+            self.error = Unsupported("malformed reply: %s" % (e,))
+
+    def close(self):
+        """
+        Finish parsing.
+
+        @return: The unmarshalled reply.
+        @rtype: L{Object}|list
+        @raise Unsupported: When the reply can not be unmarshalled directly.
+
+        """
+        if self.empty:
+            raise Unsupported("empty reply")
+        if self.error is None:
+            try:
+                ExpatBuilder.close(self)
+            except Unsupported as e:
+                self.error = e
+            except expat.ExpatError as e:
+                self.error = Unsupported("malformed reply: %s" % (e,))
+        if self.error is not None:
+            raise self.error
+        if self.body is None:
+            raise Unsupported("no SOAP body")
+        if self.wrapped and self.wrapper is None:
+            raise Unsupported("no reply document")
+        return self.result
+
+    def start(self, name, attrs):
+        node = self.element(name, attrs)
+        depth = len(self.nodes)
+        if depth:
+            node.parent = self.nodes[-1]
+        self.nodes.append(node)
+        if depth == 0:
+            if not node.match("Envelope", envns):
+                raise Unsupported("no SOAP envelope")
+            return
+        if depth == 1:
+            if self.body is None and node.match("Body", envns):
+                self.body = node
+            return
+        if node.parent is self.body:
+            if node.match("Fault", envns):
+                raise Unsupported("SOAP fault")
+            if not MultiRef().soaproot(node):
+                raise Unsupported("multiref")
+            if self.wrapped and self.wrapper is None:
+                self.wrapper = node
+        elif self.body is None or self.nodes[1] is not self.body:
+            return
+        if node.getAttribute("href") is not None:
+            raise Unsupported("multiref")
+        if self.current is not None:
+            self.unmarshaller.push(node)
+        elif depth == self.depth and node.parent is self.nodes[self.depth - 1]:
+            self.content(node)
+
+    def end(self, name):
+        node = self.nodes.pop()
+        if self.current is None:
+            return
+        value = self.unmarshaller.pop()
+        if node is self.current[1]:
+            self.append(self.current[0], node, value)
+            self.current = None
+
+    def characters(self, content):
+        if self.current is not None:
+            self.unmarshaller.characters(content)
+
+    def content(self, node):
+        """
+        A reply content node has started.
+
+        @param node: The content node.
+        @type node: L{sax.element.Element}
+
+        """
+        if self.wrapped and self.nodes[2] is not self.wrapper:
+            return
+        if not self.rtypes or self.done:
+            return
+        if len(self.rtypes) > 1:
+            rt = None
+            for t in self.rtypes:
+                if t.name == node.name:
+                    rt = t
+            if rt is None:
+                if node.get("id") is None:
+                    raise Unsupported("<%s/> not mapped" % (node.name,))
+                return
+        else:
+            rt = self.rtypes[0]
+            self.done = not self.multi
+        self.current = (rt, node)
+        self.unmarshaller.push(node, rt.resolve(nobuiltin=True))
+
+    def append(self, rt, node, value):
+        """
+        Add an unmarshalled reply content node to the result.
+
+        @param rt: The content node return type.
+        @type rt: L{xsd.sxbase.SchemaObject}
+        @param node: The content node.
+        @type node: L{sax.element.Element}
+        @param value: The unmarshalled content node.
+        @type value: L{Object}
+
+        """
+        if len(self.rtypes) == 1:
+            if self.multi:
+                self.result.append(value)
+            else:
+                self.result = value
+            return
+        composite = self.result
+        tag = node.name
+        current = getattr(composite, tag, None)
+        if current is None:
+            if rt.multi_occurrence():
+                setattr(composite, tag, [value])
+            else:
+                setattr(composite, tag, value)
+        else:
+            if not isinstance(current, list):
+                current = [current]
+                setattr(composite, tag, current)
+            current.append(value)
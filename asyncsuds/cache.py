@@ -3,15 +3,23 @@ Basic caching classes.
 
 """
 
+import asyncio
 import datetime
+import gc
+import io
 import os
 import shutil
 import tempfile
+import time
+import zlib
+from collections import OrderedDict
 from logging import getLogger
 
 import asyncsuds
 import asyncsuds.sax.element
 import asyncsuds.sax.parser
+from asyncsuds.sax.attribute import Attribute
+from asyncsuds.sax.text import Text
 
 try:
     import cPickle as pickle
@@ -49,6 +57,36 @@ class Cache(object):
         """
         raise Exception("not-implemented")
 
+    async def aget(self, id):
+        """
+        Get an object from the cache by id without blocking the event loop.
+
+        By default, this simply calls L{get()} so caches not doing any
+        blocking I/O need not override it.
+
+        @param id: The object id.
+        @type id: str
+        @return: The object, else None.
+        @rtype: any
+
+        """
+        return self.get(id)
+
+    async def aput(self, id, object):
+        """
+        Put an object into the cache without blocking the event loop.
+
+        By default, this simply calls L{put()} so caches not doing any
+        blocking I/O need not override it.
+
+        @param id: The object id.
+        @type id: str
+        @param object: The object to add.
+        @type object: any
+
+        """
+        return self.put(id, object)
+
     def purge(self, id):
         """
         Purge an object from the cache by id.
@@ -78,6 +116,11 @@ class FileCache(Cache):
     """
     A file-based URL cache.
 
+    Entries are written to a temporary file first and then renamed into place
+    so readers never see partially written entries. The asynchronous
+    L{aget()} and L{aput()} run the file I/O, together with any
+    (de)serialization done by subclasses, in the default executor.
+
     @cvar fnprefix: The file name prefix.
     @type fnprefix: str
     @cvar remove_default_location_on_exit: Whether to remove the default cache
@@ -157,16 +200,30 @@ class FileCache(Cache):
     def put(self, id, data):
         try:
             filename = self.__filename(id)
-            f = self.__open(filename, "wb")
+            self.__mktmp()
+            fd, tmp = tempfile.mkstemp(
+                prefix=os.path.basename(filename) + ".", dir=self.location
+            )
             try:
-                f.write(data)
-            finally:
-                f.close()
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, filename)
+            except Exception:
+                os.remove(tmp)
+                raise
             return data
         except Exception:
             log.debug(id, exc_info=1)
             return data
 
+    async def aget(self, id):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.get, id)
+
+    async def aput(self, id, object):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.put, id, object)
+
     def _getf(self, id):
         """Open a cached file with the given id for reading."""
         try:
@@ -190,8 +247,7 @@ class FileCache(Cache):
             self.clear()
             f = self.__open(path, "w")
             try:
-                # f.write(suds.__version__)
-                pass
+                f.write(asyncsuds.__version__)
             finally:
                 f.close()
 
@@ -280,9 +336,10 @@ class DocumentCache(FileCache):
             p = asyncsuds.sax.parser.Parser()
             return p.parse(fp)
         except Exception:
+            self.purge(id)
+        finally:
             if fp is not None:
                 fp.close()
-            self.purge(id)
 
     def put(self, id, object):
         if isinstance(
@@ -296,12 +353,23 @@ class ObjectCache(FileCache):
     """
     Pickled object file cache.
 
+    Entries start with a header naming the asyncsuds version and the entry
+    format revision they were written with, followed by the compressed
+    pickle. Entries written by any other version are ignored.
+
+    WSDL L{Definitions} are pickled as the compiled model only, using a
+    L{ModelPickler}. Any other object is pickled whole. The garbage collector is paused while loading entries as
+    it would otherwise keep scanning the many objects being created.
+
     @cvar protocol: The pickling protocol.
     @type protocol: int
+    @cvar format: The entry format revision.
+    @type format: int
 
     """
 
-    protocol = 2
+    protocol = pickle.HIGHEST_PROTOCOL
+    format = 1
 
     def fnsuffix(self):
         return "px"
@@ -311,13 +379,344 @@ class ObjectCache(FileCache):
         try:
             fp = self._getf(id)
             if fp is not None:
-                return pickle.load(fp)
+                return self.loads(fp.read())
         except Exception:
+            self.purge(id)
+        finally:
             if fp is not None:
                 fp.close()
-            self.purge(id)
 
     def put(self, id, object):
-        data = pickle.dumps(object, self.protocol)
+        data = self.dumps(object)
         super(ObjectCache, self).put(id, data)
         return object
+
+    @classmethod
+    def dumps(cls, object):
+        """
+        Serialize an object into a cache entry.
+
+        @param object: The object to serialize.
+        @type object: any
+        @return: The cache entry.
+        @rtype: bytes
+
+        """
+        from asyncsuds.wsdl import Definitions
+
+        file = io.BytesIO()
+        if isinstance(object, Definitions):
+            pickler = ModelPickler(file, cls.protocol)
+        else:
+            pickler = pickle.Pickler(file, cls.protocol)
+        pickler.dump(object)
+        return cls.__header() + zlib.compress(file.getvalue())
+
+    @classmethod
+    def loads(cls, data):
+        """
+        Deserialize an object from a cache entry.
+
+        @param data: The cache entry.
+        @type data: bytes
+        @return: The object.
+        @rtype: any
+        @raise Exception: The entry was written by another version.
+
+        """
+        header = cls.__header()
+        if not data.startswith(header):
+            raise Exception("cache entry (%r) not-valid" % (data[: len(header)],))
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return pickle.loads(zlib.decompress(memoryview(data)[len(header) :]))
+        finally:
+            if enabled:
+                gc.enable()
+
+    @classmethod
+    def __header(cls):
+        header = "asyncsuds %s/%d\n" % (asyncsuds.__version__, cls.format)
+        return asyncsuds.byte_str(header)
+
+
+class ModelPickler(pickle.Pickler):
+    """
+    Pickles an object model built from XML, e.g. WSDL L{Definitions},
+    without the XML it was built from.
+
+    The model only uses the XML elements it references for their attributes
+    and the namespace prefixes in scope. These are pickled without their
+    children and text, together with their ancestors for the namespace
+    prefixes. Equal names and text values are pickled once and shared by the
+    unpickled model.
+
+    @ivar names: The element and attribute names pickled so far.
+    @type names: dict
+    @ivar texts: The text values pickled so far.
+    @type texts: dict
+
+    """
+
+    def __init__(self, file, protocol=None):
+        """
+        @param file: The file to write the pickle to.
+        @type file: file
+        @param protocol: The pickling protocol.
+        @type protocol: int
+
+        """
+        pickle.Pickler.__init__(self, file, protocol)
+        self.names = {}
+        self.texts = {}
+
+    def reducer_override(self, obj):
+        if type(obj) is asyncsuds.sax.element.Element:
+            names = self.names
+            attributes = []
+            for a in obj._attributes:
+                name = a.qname()
+                attributes.append(names.setdefault(name, name))
+                attributes.append(a.value)
+            nsprefixes = obj._nsprefixes or None
+            name = obj.qname()
+            name = names.setdefault(name, name)
+            return _element, (name, obj.expns, nsprefixes, attributes, obj.parent)
+        if type(obj) is Text and obj.lang is None and not obj.escaped:
+            text = self.texts.setdefault(obj, obj)
+            if text is obj:
+                return Text, (str(obj),)
+            return _shared, (text,)
+        return NotImplemented
+
+
+def _element(name, expns, nsprefixes, attributes, parent):
+    """Rebuild an XML element pickled by L{ModelPickler}."""
+    node = asyncsuds.sax.element.Element(name, parent)
+    node.expns = expns
+    if nsprefixes is not None:
+        node.nsprefixes = nsprefixes
+    for i in range(0, len(attributes), 2):
+        node.append(Attribute(attributes[i], attributes[i + 1]))
+    return node
+
+
+def _shared(object):
+    """Get an object pickled by L{ModelPickler} in place of an equal one."""
+    return object
+
+
+class MemoryCache(Cache):
+    """
+    An in-memory LRU cache of live objects, optionally layered in front of
+    another (usually file based) cache.
+
+    Objects not found in memory are looked up in the backing cache and kept
+    in memory from then on. Cached objects are shared as they are, e.g. all
+    clients using this cache with I{cachingpolicy} = B{1} share the same WSDL
+    I{Definitions}. XML documents get modified while being loaded so they are
+    copied on the way in and out instead.
+
+    @ivar cache: The backing cache (may be None).
+    @type cache: L{Cache}
+    @ivar size: The maximum number of entries held in memory (0=unlimited).
+    @type size: int
+    @ivar duration: The duration after which entries held in memory expire
+        (0=never).
+    @type duration: datetime.timedelta
+    @ivar hits: The number of entries found in memory.
+    @type hits: int
+    @ivar misses: The number of entries not found in memory.
+    @type misses: int
+    @ivar evictions: The number of entries dropped from memory because the
+        cache was full or they expired.
+    @type evictions: int
+
+    """
+
+    def __init__(self, cache=None, size=100, **duration):
+        """
+        @param cache: The backing cache.
+        @type cache: L{Cache}
+        @param size: The maximum number of entries held in memory.
+        @type size: int
+        @param duration: The duration after which entries held in memory
+            expire (default: 0=never).
+        @type duration: keyword arguments for datetime.timedelta constructor
+
+        """
+        self.cache = cache
+        self.size = size
+        self.duration = datetime.timedelta(**duration)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__entries = OrderedDict()
+
+    def get(self, id):
+        object = self.__get(id)
+        if object is None and self.cache is not None:
+            object = self.cache.get(id)
+            if object is not None:
+                self.__put(id, self.__copy(object))
+        return object
+
+    def put(self, id, object):
+        self.__put(id, self.__copy(object))
+        if self.cache is not None:
+            self.cache.put(id, object)
+        return object
+
+    async def aget(self, id):
+        object = self.__get(id)
+        if object is None and self.cache is not None:
+            object = await self.cache.aget(id)
+            if object is not None:
+                self.__put(id, self.__copy(object))
+        return object
+
+    async def aput(self, id, object):
+        self.__put(id, self.__copy(object))
+        if self.cache is not None:
+            await self.cache.aput(id, object)
+        return object
+
+    def purge(self, id):
+        self.__entries.pop(id, None)
+        if self.cache is not None:
+            self.cache.purge(id)
+
+    def clear(self):
+        self.__entries.clear()
+        if self.cache is not None:
+            self.cache.clear()
+
+    def stats(self):
+        """
+        Get the cache statistics.
+
+        @return: The I{hits}, I{misses}, I{evictions} and the current number
+            of I{entries} held in memory.
+        @rtype: dict
+
+        """
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            entries=len(self.__entries),
+        )
+
+    def __get(self, id):
+        entry = self.__entries.get(id)
+        if entry is not None:
+            object, expires = entry
+            if expires is None or expires > time.monotonic():
+                self.__entries.move_to_end(id)
+                self.hits += 1
+                return self.__copy(object)
+            del self.__entries[id]
+            self.evictions += 1
+            log.debug("%s expired, evicted", id)
+        self.misses += 1
+
+    def __put(self, id, object):
+        expires = None
+        if self.duration:
+            expires = time.monotonic() + self.duration.total_seconds()
+        self.__entries[id] = (object, expires)
+        self.__entries.move_to_end(id)
+        while self.size and len(self.__entries) > self.size:
+            self.__entries.popitem(last=False)
+            self.evictions += 1
+
+    @staticmethod
+    def __copy(object):
+        if isinstance(object, asyncsuds.sax.document.Document):
+            root = object.root()
+            if root is not None:
+                root = root.clone()
+            return asyncsuds.sax.document.Document(root)
+        if isinstance(object, asyncsuds.sax.element.Element):
+            return object.clone()
+        return object
+
+
+class ReplyCache(Cache):
+    """
+    A cache of SOAP replies keeping hit statistics by operation.
+
+    Replies are held in a backing cache, by default an in-memory LRU
+    L{MemoryCache}, which also decides when they expire. The client forms
+    entry ids as I{<operation>-<hash>}, the hash covering the location, the
+    HTTP headers and the request envelope.
+
+    @ivar cache: The backing cache.
+    @type cache: L{Cache}
+    @ivar hits: The number of replies found by operation.
+    @type hits: dict
+    @ivar misses: The number of replies not found by operation.
+    @type misses: dict
+
+    """
+
+    def __init__(self, cache=None, size=1000, **duration):
+        """
+        @param cache: The backing cache (default: a L{MemoryCache} holding at
+            most I{size} replies for I{duration}).
+        @type cache: L{Cache}
+        @param size: The maximum number of replies held in memory by the
+            default backing cache.
+        @type size: int
+        @param duration: The duration after which replies held by the default
+            backing cache expire (default: 0=never).
+        @type duration: keyword arguments for datetime.timedelta constructor
+
+        """
+        if cache is None:
+            cache = MemoryCache(size=size, **duration)
+        self.cache = cache
+        self.hits = {}
+        self.misses = {}
+
+    def get(self, id):
+        return self.__count(id, self.cache.get(id))
+
+    def put(self, id, object):
+        return self.cache.put(id, object)
+
+    async def aget(self, id):
+        return self.__count(id, await self.cache.aget(id))
+
+    async def aput(self, id, object):
+        return await self.cache.aput(id, object)
+
+    def purge(self, id):
+        self.cache.purge(id)
+
+    def clear(self):
+        self.cache.clear()
+
+    def stats(self):
+        """
+        Get the cache statistics.
+
+        @return: The I{hits}, I{misses} and hit I{ratio} by operation.
+        @rtype: {str: dict}
+
+        """
+        result = {}
+        for name in set(self.hits).union(self.misses):
+            hits = self.hits.get(name, 0)
+            misses = self.misses.get(name, 0)
+            result[name] = dict(
+                hits=hits, misses=misses, ratio=hits / float(hits + misses)
+            )
+        return result
+
+    def __count(self, id, object):
+        name = id.rpartition("-")[0]
+        counts = self.misses if object is None else self.hits
+        counts[name] = counts.get(name, 0) + 1
+        return object
@@ -4,8 +4,14 @@ Service proxy implementation providing access to web services.
 """
 
 import asyncio
+import hashlib
 import http.client
+import inspect
+import io
+import time
+from copy import copy
 from copy import deepcopy
+from functools import partial
 from http.cookiejar import CookieJar
 from logging import getLogger
 from urllib.parse import unquote
@@ -26,8 +32,10 @@ from asyncsuds.plugin import PluginContainer
 from asyncsuds.properties import Unskin
 from asyncsuds.reader import DefinitionsReader
 from asyncsuds.resolver import PathResolver
+from asyncsuds.sax.writer import Writer
 from asyncsuds.servicedefinition import ServiceDefinition
 from asyncsuds.umx.basic import Basic as UmxBasic
+from asyncsuds.umx.stream import Unsupported
 from asyncsuds.wsdl import Definitions
 
 log = getLogger(__name__)
@@ -89,6 +97,33 @@ class Client(object):
         """
         return sobject.__metadata__
 
+    @classmethod
+    def from_compiled(cls, path, **kwargs):
+        """
+        Create a client using a service model compiled ahead of time with
+        I{python -m asyncsuds.compile}.
+
+        The WSDL and its schemas are neither fetched nor processed, so the
+        client is ready to use without calling L{connect()}. The service
+        location is usually given using the I{location} option.
+
+        @param path: The compiled service model file.
+        @type path: str
+        @param kwargs: keyword arguments.
+        @see: L{Options}
+        @return: The client.
+        @rtype: L{Client}
+
+        """
+        with open(path, "rb") as f:
+            wsdl = asyncsuds.cache.ObjectCache.loads(f.read())
+        client = cls(wsdl.url, **kwargs)
+        client.reader = DefinitionsReader(client.options, Definitions)
+        client.reader.verify_ssl = client.verify_ssl
+        client.reader.proxy = client.proxy
+        client.__attach(client.reader.attach(wsdl))
+        return client
+
     def __init__(self, url, verify_ssl=True, proxy=None, **kwargs):
         """
         @param url: The URL for the WSDL.
@@ -100,9 +135,10 @@ class Client(object):
         u = urlparse(url)
         username = unquote(u.username) if u.username else ""
         password = unquote(u.password) if u.password else ""
+        hostname = u.hostname or ""
         port_string = f":{u.port}" if u.port else ""
         query_string = f"?{u.query}" if u.query else ""
-        self.url = f"{u.scheme}://{u.hostname}{port_string}{u.path}{query_string}"
+        self.url = f"{u.scheme}://{hostname}{port_string}{u.path}{query_string}"
         options = Options()
         options.transport = asyncsuds.transport.http_transport.HttpAuthenticated(
             username=username, password=password
@@ -124,7 +160,17 @@ class Client(object):
         self.reader = DefinitionsReader(self.options, Definitions)
         self.reader.verify_ssl = self.verify_ssl
         self.reader.proxy = self.proxy
-        self.wsdl = await self.reader.open(self.url, headers=self.headers)
+        self.__attach(await self.reader.open(self.url, headers=self.headers))
+
+    def __attach(self, wsdl):
+        """
+        Set up the service proxy for a loaded WSDL.
+
+        @param wsdl: The WSDL object.
+        @type wsdl: L{Definitions}
+
+        """
+        self.wsdl = wsdl
         self.factory = Factory(self.wsdl)
         self.service = ServiceSelector(self, self.wsdl.services)
         self.sd_list = []
@@ -134,6 +180,27 @@ class Client(object):
         plugins = PluginContainer(self.options.plugins)
         plugins.init.initialized(wsdl=self.wsdl)
 
+    async def close(self):
+        """
+        Release the transport's pooled connections.
+
+        Clones share the transport's connection pool with this client so
+        closing any of them closes the pool for all. A closed pool gets
+        reopened on next use.
+
+        """
+        transport = self.options.transport
+        if transport is not None:
+            await transport.close()
+
+    async def __aenter__(self):
+        if self.wsdl is None:
+            await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
     def set_options(self, **kwargs):
         """
         Set options.
@@ -171,8 +238,9 @@ class Client(object):
         """
         Get a shallow clone of this object.
 
-        The clone only shares the WSDL. All other attributes are unique to the
-        cloned object including options.
+        The clone only shares the WSDL and the transport's connection pool.
+        All other attributes are unique to the cloned object including
+        options.
 
         @return: A shallow clone.
         @rtype: L{Client}
@@ -188,12 +256,51 @@ class Client(object):
         cp = Unskin(clone.options)
         mp = Unskin(self.options)
         cp.update(deepcopy(mp))
+        clone.url = self.url
+        clone.headers = self.headers
+        clone.verify_ssl = self.verify_ssl
+        clone.proxy = self.proxy
+        clone.reader = self.reader
         clone.wsdl = self.wsdl
         clone.factory = self.factory
         clone.service = ServiceSelector(clone, self.wsdl.services)
         clone.sd_list = self.sd_list
         return clone
 
+    def batch(self, calls, concurrency=10, timeout=None, ordered=True):
+        """
+        Invoke a batch of web service operations concurrently.
+
+        Each item in I{calls} is a (I{method}, I{arguments}) tuple where the
+        method is either a L{Method} or a method name and the arguments are
+        given as described for L{Method.map()}. Items are consumed lazily and
+        at most I{concurrency} invocations are in flight at any time.
+
+        Failures (e.g. L{WebFault} or timeouts) are reported on the result of
+        the failing item and do not affect the rest of the batch.
+
+        @param calls: Invocations.
+        @type calls: iterable of (L{Method}|str, I{arguments})
+        @param concurrency: The maximum number of invocations in flight.
+        @type concurrency: int
+        @param timeout: A per invocation timeout (seconds), None=no timeout.
+        @type timeout: float
+        @param ordered: Yield results in submission (True) or completion
+            (False) order.
+        @type ordered: bool
+        @return: An asynchronous iterator of results.
+        @rtype: I{async iterator} of L{BatchResult}
+
+        """
+
+        def methods():
+            for method, item in calls:
+                if isinstance(method, str):
+                    method = getattr(self.service, method)
+                yield method, item
+
+        return _batch(methods(), concurrency, timeout, ordered)
+
     def __str__(self):
         s = ["\n"]
         s.append("Suds ( https://fedorahosted.org/suds/ )")
@@ -582,6 +689,33 @@ class Method:
                 raise
             return http.client.INTERNAL_SERVER_ERROR, e
 
+    def map(self, calls, concurrency=10, timeout=None, ordered=True):
+        """
+        Invoke the method once for each item in I{calls}, concurrently.
+
+        Each item provides the arguments for one invocation: a I{tuple} holds
+        the positional arguments, a I{dict} the keyword arguments and any
+        other value is passed as the only positional argument.
+
+        Items are consumed lazily, so I{calls} may be an arbitrarily long
+        iterator. See L{Client.batch()} for details on the results.
+
+        @param calls: Invocation arguments.
+        @type calls: iterable
+        @param concurrency: The maximum number of invocations in flight.
+        @type concurrency: int
+        @param timeout: A per invocation timeout (seconds), None=no timeout.
+        @type timeout: float
+        @param ordered: Yield results in submission (True) or completion
+            (False) order.
+        @type ordered: bool
+        @return: An asynchronous iterator of results.
+        @rtype: I{async iterator} of L{BatchResult}
+
+        """
+        calls = ((self, item) for item in calls)
+        return _batch(calls, concurrency, timeout, ordered)
+
     def faults(self):
         """Get faults option."""
         return self.client.options.faults
@@ -638,6 +772,43 @@ class RequestContext:
         return self.__process_reply(reply, status, description)
 
 
+class BatchResult:
+    """
+    The result of a single invocation made as part of a batch.
+
+    @ivar index: The position of the invocation in the batch.
+    @type index: int
+    @ivar value: The invoked web service operation return value.
+    @type value: I{builtin}|I{subclass of} L{Object}|I{bytes}|I{None}
+    @ivar error: The exception raised by the invocation, None on success.
+    @type error: Exception
+
+    """
+
+    def __init__(self, index, value=None, error=None):
+        """
+        @param index: The position of the invocation in the batch.
+        @type index: int
+        @param value: The invocation return value.
+        @type value: any
+        @param error: The exception raised by the invocation.
+        @type error: Exception
+
+        """
+        self.index = index
+        self.value = value
+        self.error = error
+
+    def ok(self):
+        """Get whether the invocation succeeded."""
+        return self.error is None
+
+    def __repr__(self):
+        if self.error is None:
+            return "BatchResult (index=%d, value=%r)" % (self.index, self.value)
+        return "BatchResult (index=%d, error=%r)" % (self.index, self.error)
+
+
 class _SoapClient:
     """
     An internal lightweight SOAP based web service operation client.
@@ -665,6 +836,9 @@ class _SoapClient:
 
     """
 
+    # Coalesced round trips in flight by request.
+    __inflight = {}
+
     def __init__(self, client, method):
         """
         @param client: A suds client.
@@ -711,7 +885,7 @@ class _SoapClient:
         timer = metrics.Timer()
         timer.start()
         binding = self.method.binding.input
-        soapenv = binding.get_message(self.method, args, kwargs)
+        soapenv = binding.get_message(self.method, args, kwargs, self.options)
         timer.stop()
         method_name = self.method.name
         metrics.log.debug("message for '%s' created: %s", method_name, timer)
@@ -746,10 +920,9 @@ class _SoapClient:
         plugins = PluginContainer(self.options.plugins)
         plugins.message.marshalled(envelope=soapenv.root())
         if self.options.prettyxml:
-            soapenv = soapenv.str()
+            soapenv = soapenv.str().encode("utf-8")
         else:
-            soapenv = soapenv.plain()
-        soapenv = soapenv.encode("utf-8")
+            soapenv = Writer().write(soapenv).getvalue()
         ctx = plugins.message.sending(envelope=soapenv)
         soapenv = ctx.envelope
         if self.options.nosend:
@@ -757,18 +930,73 @@ class _SoapClient:
         request = asyncsuds.transport.Request(location, soapenv)
         request.headers = self.__headers()
         request.verify_ssl = self.verify_ssl
+        request.retry = self.options.retry
+        request.idempotent = self.__opted(self.options.idempotent)
+        reply = document = key = None
+        direct = self.__replyparser()
+        chunks = []
         try:
             timer = metrics.Timer()
             timer.start()
-            reply = yield from self.options.transport.send(request)
+            cache = self.__replycache()
+            if cache is not None:
+                key = self.__replykey(request)
+                reply = yield from cache.aget(key)
+            if reply is not None:
+                log.debug("reply for (%s) found in the cache", location)
+                key = None
+                if direct is not None:
+                    direct.feed(reply)
+            elif (
+                cache is not None
+                or self.__opted(self.options.coalesce)
+                or self.__hedge() is not None
+            ):
+                reply = yield from self.__fetch(request)
+                if direct is not None:
+                    direct.feed(reply)
+            elif self.__streaming():
+                parser = direct
+                if parser is None:
+                    parser = asyncsuds.sax.parser.StreamParser(self.options.parser)
+
+                def feed(data):
+                    if direct is not None:
+                        chunks.append(data)
+                    parser.feed(data)
+
+                yield from self.options.transport.stream(request, feed)
+                if direct is None:
+                    document = parser.close()
+            else:
+                reply = yield from self.options.transport.send(request)
+                if direct is not None:
+                    direct.feed(reply)
             timer.stop()
             metrics.log.debug("waited %s on server reply", timer)
         except asyncsuds.transport.TransportError as e:
-            content = e.fp and e.fp.read() or ""
+            content = e.fp and e.fp.read() or b""
             return self.process_reply(content, e.httpcode, tostr(e))
-        return self.process_reply(reply, None, None)
+        if direct is not None:
+            try:
+                result = direct.close()
+            except Unsupported as e:
+                log.debug("reply not unmarshalled directly: %s", e)
+                if reply is None:
+                    reply = b"".join(chunks)
+            else:
+                log.debug("Reply HTTP status - %d", http.client.OK)
+                if key is not None:
+                    yield from cache.aput(key, reply)
+                if self.options.faults:
+                    return result
+                return http.client.OK, result
+        result = self.process_reply(reply, None, None, document)
+        if key is not None and self.__succeeded(result):
+            yield from cache.aput(key, reply)
+        return result
 
-    def process_reply(self, reply, status, description):
+    def process_reply(self, reply, status, description, document=None):
         """
         Process a web service operation SOAP reply.
 
@@ -782,6 +1010,9 @@ class _SoapClient:
         @type status: int|I{None}
         @param description: Additional status description.
         @type description: str
+        @param document: The reply already parsed while being received, in
+            which case I{reply} is not used.
+        @type document: L{Document}
         @return: The invoked web service operation return value.
         @rtype: I{builtin}|I{subclass of} L{Object}|I{bytes}|I{None}
 
@@ -818,7 +1049,7 @@ class _SoapClient:
         # if the response message is a SOAP Fault.
         replyroot = None
         if status in (http.client.OK, http.client.INTERNAL_SERVER_ERROR):
-            replyroot = _parse(reply)
+            replyroot = document or _parse(reply, self.options.parser)
             plugins.message.parsed(reply=replyroot)
             fault = self.__get_fault(replyroot)
             if fault:
@@ -850,6 +1081,228 @@ class _SoapClient:
             return result
         return http.client.OK, result
 
+    def __replyparser(self):
+        """
+        Get the parser unmarshalling the reply directly, if enabled.
+
+        @return: The reply parser, or None when replies are to be processed
+            from the parsed XML tree.
+        @rtype: L{asyncsuds.bindings.stream.ReplyParser}
+
+        """
+        options = self.options
+        if not options.directunmarshal or options.retxml or options.plugins:
+            return None
+        return self.method.binding.output.replyparser(self.method)
+
+    def __opted(self, value):
+        """
+        Get whether an option given for all or only some operations applies
+        to the invoked one.
+
+        @param value: The option value: a flag for all operations or the
+            names of the operations it applies to.
+        @type value: bool|I{collection} of str
+        @return: True if the option applies.
+        @rtype: bool
+
+        """
+        if isinstance(value, bool):
+            return value
+        return self.method.name in value
+
+    def __replycache(self):
+        """
+        Get the reply cache if replies of the invoked operation are cached.
+
+        @return: The reply cache, else None.
+        @rtype: L{Cache}
+
+        """
+        cache = self.options.replycache
+        if cache is not None and self.__opted(self.options.cachereplies):
+            return cache
+
+    def __replykey(self, request):
+        """
+        Get the reply cache entry id for a SOAP request.
+
+        @param request: The request.
+        @type request: L{asyncsuds.transport.Request}
+        @return: The operation name and a digest of the location, the HTTP
+            headers and the request envelope.
+        @rtype: str
+
+        """
+        digest = hashlib.sha256(request.url.encode())
+        for header in sorted(request.headers.items()):
+            digest.update(("\0%s: %s" % header).encode())
+        digest.update(b"\0")
+        digest.update(request.message)
+        return "%s-%s" % (self.method.name, digest.hexdigest())
+
+    def __succeeded(self, result):
+        """
+        Get whether a processed reply reports success, i.e. it is neither a
+        SOAP fault nor an HTTP error and may be cached.
+
+        @param result: The L{process_reply()} result.
+        @type result: I{builtin}|I{subclass of} L{Object}|I{bytes}|I{None}
+        @return: True if successful.
+        @rtype: bool
+
+        """
+        if self.options.faults:
+            return True
+        return not isinstance(result, tuple) or result[0] == http.client.OK
+
+    def __hedge(self):
+        """
+        Get the hedging policy if the invoked operation is hedged.
+
+        @return: The hedging policy, else None.
+        @rtype: L{HedgePolicy}
+
+        """
+        hedge = self.options.hedge
+        if hedge is not None and self.__opted(self.options.hedged):
+            return hedge
+
+    async def __fetch(self, request):
+        """
+        Send a SOAP request, reading the whole reply.
+
+        The request is hedged and coalesced with identical ones in flight if
+        enabled.
+
+        @param request: The request.
+        @type request: L{asyncsuds.transport.Request}
+        @return: The SOAP reply envelope.
+        @rtype: I{bytes}
+
+        """
+        send = self.options.transport.send
+        hedge = self.__hedge()
+        if hedge is not None:
+            send = partial(self.__hedged, hedge)
+        if self.__opted(self.options.coalesce):
+            return await self.__coalesced(request, send)
+        return await send(request)
+
+    async def __hedged(self, hedge, request):
+        """
+        Send a SOAP request and, unless answered in time, a copy of it,
+        taking the first reply and cancelling the other request.
+
+        The latency recorded is the one seen by the caller, i.e. measured
+        from sending the original request whichever of them answers, so that
+        slow originals overtaken by their copies are still accounted for.
+
+        @param hedge: The hedging policy.
+        @type hedge: L{HedgePolicy}
+        @param request: The request.
+        @type request: L{asyncsuds.transport.Request}
+        @return: The SOAP reply envelope.
+        @rtype: I{bytes}
+
+        """
+        name = self.method.name
+        send = self.options.transport.send
+        started = time.monotonic()
+        tasks = [asyncio.ensure_future(send(request))]
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=hedge.start(name))
+            if not done and hedge.spend():
+                if hedge.location is not None:
+                    request = copy(request)
+                    request.url = hedge.location
+                log.debug("hedging the request with a copy to (%s)", request.url)
+                tasks.append(asyncio.ensure_future(send(request)))
+            pending = tasks
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in tasks:
+                    if task in done and task.exception() is None:
+                        latency = time.monotonic() - started
+                        hedge.record(name, latency, task is not tasks[0])
+                        return task.result()
+                if not pending:
+                    return tasks[0].result()
+        finally:
+            for task in tasks:
+                if not task.cancel() and not task.cancelled():
+                    task.exception()
+
+    async def __coalesced(self, request, send):
+        """
+        Send a SOAP request, sharing a single round trip with identical
+        requests in flight at the same time.
+
+        The round trip runs on its own so that cancelling any of the waiting
+        invocations does not affect the others.
+
+        @param request: The request.
+        @type request: L{asyncsuds.transport.Request}
+        @param send: Sends the request.
+        @type send: callable(L{asyncsuds.transport.Request})
+        @return: The SOAP reply envelope.
+        @rtype: I{bytes}
+        @raise asyncsuds.transport.TransportError: The request failed, each
+            waiting invocation gets its own copy of the error.
+
+        """
+        transport = self.options.transport
+        key = (
+            asyncio.get_event_loop(),
+            transport,
+            request.url,
+            tuple(sorted(request.headers.items())),
+            request.message,
+        )
+        inflight = self.__inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self.__roundtrip(send, request))
+            self.__inflight[key] = inflight
+            inflight.add_done_callback(lambda f: self.__inflight.pop(key, None))
+        else:
+            log.debug("coalesced with the request in flight to (%s)", request.url)
+        reply, error = await asyncio.shield(inflight)
+        if error is not None:
+            reason, httpcode, content = error
+            raise asyncsuds.transport.TransportError(
+                reason, httpcode, io.BytesIO(content)
+            )
+        return reply
+
+    @staticmethod
+    async def __roundtrip(send, request):
+        """
+        Send a SOAP request shared by coalesced invocations.
+
+        @return: The reply and None, or None and the (reason, httpcode,
+            content) of the failed request.
+        @rtype: tuple
+
+        """
+        try:
+            return (await send(request)), None
+        except asyncsuds.transport.TransportError as e:
+            content = e.fp and e.fp.read() or b""
+            return None, (tostr(e), e.httpcode, content)
+
+    def __streaming(self):
+        """
+        Get whether the reply is to be parsed while being received.
+
+        @return: True unless the raw reply is needed.
+        @rtype: bool
+
+        """
+        options = self.options
+        return options.stream and not (options.retxml or options.plugins)
+
     def __get_fault(self, replyroot):
         """
         Extract fault information from a SOAP reply.
@@ -932,8 +1385,10 @@ class _SimClient(_SoapClient):
         msg = simulation.get("msg")
         if msg is not None:
             assert msg.__class__ is asyncsuds.byte_str_class
-            return self.send(_parse(msg))
-        msg = self.method.binding.input.get_message(self.method, args, kwargs)
+            return self.send(_parse(msg, self.options.parser))
+        msg = self.method.binding.input.get_message(
+            self.method, args, kwargs, self.options
+        )
         log.debug("inject (simulated) send message:\n%s", msg)
         reply = simulation.get("reply")
         if reply is not None:
@@ -946,7 +1401,75 @@ class _SimClient(_SoapClient):
         raise Exception("reply or msg injection parameter expected")
 
 
-def _parse(string):
+async def _batch(calls, concurrency, timeout, ordered):
+    """
+    Run (L{Method}, I{arguments}) invocations with bounded concurrency.
+
+    New invocations are only started as running ones complete. When results
+    are ordered, at most I{concurrency} results completed ahead of the oldest
+    running invocation are held back, so memory stays bounded for arbitrarily
+    large batches.
+
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be positive")
+    calls = enumerate(calls)
+    pending = set()
+    completed = {}
+    next_index = 0
+    exhausted = False
+    try:
+        while True:
+            while (
+                not exhausted
+                and len(pending) < concurrency
+                and len(completed) < concurrency
+            ):
+                try:
+                    index, (method, item) = next(calls)
+                except StopIteration:
+                    exhausted = True
+                    break
+                task = asyncio.ensure_future(_invoke(index, method, item, timeout))
+                pending.add(task)
+            if not pending:
+                break
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                result = task.result()
+                if not ordered:
+                    yield result
+                    continue
+                completed[result.index] = result
+            while next_index in completed:
+                yield completed.pop(next_index)
+                next_index += 1
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _invoke(index, method, item, timeout):
+    """Make a single batch invocation, capturing any raised exception."""
+    if isinstance(item, tuple):
+        args, kwargs = item, {}
+    elif isinstance(item, dict):
+        args, kwargs = (), item
+    else:
+        args, kwargs = (item,), {}
+    try:
+        result = method(*args, **kwargs)
+        if inspect.isawaitable(result):
+            result = await asyncio.wait_for(result, timeout)
+    except Exception as e:
+        log.debug("batch invocation %d failed", index, exc_info=True)
+        return BatchResult(index, error=e)
+    return BatchResult(index, result)
+
+
+def _parse(string, backend="sax"):
     """
     Parses given XML document content.
 
@@ -955,9 +1478,11 @@ def _parse(string):
 
     @param string: XML document content to parse.
     @type string: I{bytes}
+    @param backend: The parser backend.
+    @type backend: str
     @return: Resulting root XML element node or None.
     @rtype: L{Element}|I{None}
 
     """
     if string:
-        return asyncsuds.sax.parser.Parser().parse(string=string)
+        return asyncsuds.sax.parser.Parser(backend).parse(string=string)
@@ -0,0 +1,103 @@
+"""
+Ahead-of-time WSDL compilation.
+
+Fetches a WSDL together with everything it imports, builds the service model
+and writes it into a file that L{Client.from_compiled()} loads without
+fetching or processing the WSDL again.
+
+Usage: python -m asyncsuds.compile <wsdl-url-or-file> -o service.bin
+
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from urllib.parse import urlparse
+from urllib.request import pathname2url
+from urllib.request import url2pathname
+
+from asyncsuds.cache import NoCache
+from asyncsuds.cache import ObjectCache
+from asyncsuds.client import Client
+from asyncsuds.store import DocumentStore
+from asyncsuds.wsdl import Definitions
+
+
+class FileStore(DocumentStore):
+    """
+    A document store also providing local files referenced using I{file}
+    URLs, so that WSDLs and schemas may be compiled from the file system.
+
+    """
+
+    def open(self, url):
+        content = DocumentStore.open(self, url)
+        if content is None:
+            u = urlparse(url)
+            if u.scheme == "file":
+                with open(url2pathname(u.path), "rb") as f:
+                    content = f.read()
+        return content
+
+
+def wsdlurl(name):
+    """
+    Get the URL of a WSDL given by URL or local file name.
+
+    @param name: A WSDL URL or file name.
+    @type name: str
+    @return: The WSDL URL.
+    @rtype: str
+
+    """
+    if "://" in name:
+        return name
+    return "file://" + pathname2url(os.path.abspath(name))
+
+
+async def build(url, path, **kwargs):
+    """
+    Compile a WSDL into a service model file.
+
+    @param url: The WSDL URL.
+    @type url: str
+    @param path: The name of the service model file written.
+    @type path: str
+    @param kwargs: keyword arguments.
+    @see: L{Options}
+    @return: The size of the service model file.
+    @rtype: int
+
+    """
+    kwargs.setdefault("cache", NoCache())
+    kwargs.setdefault("documentStore", FileStore())
+    client = Client(url, **kwargs)
+    wsdl = Definitions(client.url, client.options, headers=client.headers)
+    try:
+        await wsdl.connect()
+    finally:
+        await client.close()
+    data = ObjectCache.dumps(wsdl)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m asyncsuds.compile",
+        description="Compile a WSDL into a service model file loaded using "
+        "Client.from_compiled().",
+    )
+    parser.add_argument("wsdl", help="the WSDL URL or file name")
+    parser.add_argument(
+        "-o", "--output", required=True, help="the service model file written"
+    )
+    args = parser.parse_args(argv)
+    size = asyncio.run(build(wsdlurl(args.wsdl), args.output))
+    print("%s: %d bytes" % (args.output, size))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -36,6 +36,8 @@ class Typed(Core):
     @type schema: L{xsd.schema.Schema}
     @ivar resolver: A schema type resolver.
     @type resolver: L{GraphResolver}
+    @ivar orderings: The attribute ordering of the XSD types seen so far.
+    @type orderings: dict
     """
 
     def __init__(self, schema, xstq=True):
@@ -51,6 +53,7 @@ class Typed(Core):
         self.schema = schema
         self.xstq = xstq
         self.resolver = GraphResolver(self.schema)
+        self.orderings = {}
 
     def reset(self):
         self.resolver.reset()
@@ -252,6 +255,9 @@ class Typed(Core):
         @return: An ordered list of attribute names.
         @rtype: list
         """
+        result = self.orderings.get(type)
+        if result is not None:
+            return result
         result = []
         for child, ancestry in type.resolve():
             name = child.name
@@ -260,6 +266,7 @@ class Typed(Core):
             if child.isattr():
                 name = "_%s" % child.name
             result.append(name)
+        self.orderings[type] = result
         return result
 
 
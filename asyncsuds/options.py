@@ -8,6 +8,8 @@ from asyncsuds.properties import *
 from asyncsuds.store import DocumentStore
 from asyncsuds.store import defaultDocumentStore
 from asyncsuds.transport import Transport
+from asyncsuds.transport.http_transport import HedgePolicy
+from asyncsuds.transport.http_transport import RetryPolicy
 from asyncsuds.wsse import Security
 from asyncsuds.xsd.doctor import Doctor
 
@@ -109,6 +111,75 @@ class Options(Skin):
             ever automatically unwrapped.
                 - type: I{bool}
                 - default: True
+        - B{fetchlimit} - The maximum number of WSDL/XSD documents fetched
+            concurrently while loading the WSDL.
+                - type: I{int}
+                - default: 10
+        - B{stream} - Parse replies incrementally while they are being
+            received instead of reading them completely first. Not used
+            together with I{retxml} or I{plugins}, which need the raw reply.
+                - type: I{bool}
+                - default: False
+        - B{parser} - The XML parser backend: I{sax} (the standard SAX
+            parser), I{expat} (expat without the SAX layer, faster) or I{lxml}
+            (when installed, else I{expat}; not faster than I{sax}, as the
+            elements are still built in Python).
+                - type: I{str}
+                - default: sax
+        - B{directunmarshal} - Unmarshal I{document/literal} replies while
+            parsing them, without building the reply XML tree first. Replies
+            needing the tree (faults, multirefs, mixed content) fall back to
+            regular processing; with I{stream} the raw reply is kept for
+            that. Not used together with I{retxml} or I{plugins}.
+                - type: I{bool}
+                - default: False
+        - B{coalesce} - Share a single round trip between identical
+            invocations in flight at the same time, i.e. ones sending the
+            same envelope with the same HTTP headers to the same location
+            using the same transport. Each of them gets its own copy of the
+            reply unmarshalled. Only meant for idempotent (read-only)
+            operations, so either True for all operations or the names of
+            the operations to coalesce. Coalesced invocations read the whole
+            reply before processing it, i.e. I{stream} is not used for them.
+                - type: I{bool}|I{list}|I{tuple}|I{set}
+                - default: False
+        - B{replycache} - The cache holding the raw replies of the operations
+            selected using I{cachereplies}, usually a L{ReplyCache}. Replies
+            are looked up by the location, the HTTP headers and the request
+            envelope, so the cache is not to be shared by clients
+            authenticating differently.
+                - type: L{Cache}
+                - default: None
+        - B{cachereplies} - Look up replies in the I{replycache} before
+            sending requests and add successful replies to it. Only meant for
+            idempotent (read-only) operations, so either True for all
+            operations or the names of the operations to cache. Cached
+            invocations read the whole reply before processing it, i.e.
+            I{stream} is not used for them.
+                - type: I{bool}|I{list}|I{tuple}|I{set}
+                - default: False
+        - B{retry} - The policy for sending failed requests again, reusing
+            the already serialized envelope. Only requests of I{idempotent}
+            operations are retried on errors and retried HTTP statuses,
+            others only when no connection could be established. The
+            policy's I{deadline} applies to all invocations.
+                - type: L{RetryPolicy}
+                - default: None
+        - B{idempotent} - The operations safe to invoke more than once,
+            either True for all operations or their names.
+                - type: I{bool}|I{list}|I{tuple}|I{set}
+                - default: False
+        - B{hedge} - The policy for sending a second copy of requests of
+            the I{hedged} operations not answered in time, using the first
+            reply received and cancelling the other request.
+                - type: L{HedgePolicy}
+                - default: None
+        - B{hedged} - The operations hedged, either True for all operations
+            or their names. Only meant for idempotent (read-only) operations.
+            Hedged invocations read the whole reply before processing it,
+            i.e. I{stream} is not used for them.
+                - type: I{bool}|I{list}|I{tuple}|I{set}
+                - default: False
     """
 
     def __init__(self, **kwargs):
@@ -134,5 +205,16 @@ class Options(Skin):
             Definition("plugins", (list, tuple), []),
             Definition("nosend", bool, False),
             Definition("unwrap", bool, True),
+            Definition("fetchlimit", int, 10),
+            Definition("stream", bool, False),
+            Definition("parser", str, "sax"),
+            Definition("directunmarshal", bool, False),
+            Definition("coalesce", (bool, list, tuple, set, frozenset), False),
+            Definition("replycache", Cache, None),
+            Definition("cachereplies", (bool, list, tuple, set, frozenset), False),
+            Definition("retry", RetryPolicy, None),
+            Definition("idempotent", (bool, list, tuple, set, frozenset), False),
+            Definition("hedge", HedgePolicy, None),
+            Definition("hedged", (bool, list, tuple, set, frozenset), False),
         ]
         Skin.__init__(self, domain, definitions, kwargs)
@@ -108,6 +108,9 @@ class Endpoint(object):
         return hash(self.target)
 
     def __getattr__(self, name):
+        if name == "target":
+            # Not yet initialized, e.g. while being copied or unpickled.
+            raise AttributeError(name)
         return getattr(self.target, name)
 
 
@@ -6,12 +6,15 @@ caching system.
 
 import asyncio
 from hashlib import md5
+from logging import getLogger
 
 import asyncsuds.cache
 import asyncsuds.plugin
 import asyncsuds.sax.parser
 import asyncsuds.transport
 
+log = getLogger(__name__)
+
 
 class Reader(object):
     """
@@ -55,6 +58,9 @@ class DefinitionsReader(Reader):
 
     """
 
+    # WSDL loads in progress (and their caches) by what they depend on.
+    __loading = {}
+
     def __init__(self, options, fn):
         """
         @param options: An options object.
@@ -84,22 +90,98 @@ class DefinitionsReader(Reader):
         """
         cache = self.__cache()
         id = self.mangle(url, "wsdl")
-        wsdl = cache.get(id)
+        wsdl = yield from cache.aget(id)
         if wsdl is None:
-            wsdl = self.fn(url, self.options, headers=headers)
-            wsdl.verify_ssl = self.verify_ssl
-            wsdl.proxy = self.proxy
-            yield from wsdl.connect()
-            cache.put(id, wsdl)
-        else:
-            # Cached WSDL Definitions objects may have been created with
-            # different options so we update them here with our current ones.
+            wsdl = yield from self.__singleflight(cache, id, url, headers)
+        return self.attach(wsdl)
+
+    def attach(self, wsdl):
+        """
+        Attach a WSDL loaded elsewhere, e.g. from the cache, to this reader.
+
+        Unpickled WSDL Definitions objects come without any options, so they
+        get our current ones. Others are left alone, since they may be shared
+        by clients with different options, e.g. from a L{MemoryCache}. Each
+        client passes its own options to the bindings when invoking methods.
+
+        @param wsdl: The WSDL object.
+        @type wsdl: I{Definitions}
+        @return: The WSDL object.
+        @rtype: I{Definitions}
+
+        """
+        if getattr(wsdl, "options", None) is None:
             wsdl.options = self.options
             for imp in wsdl.imports:
-                imp.imported.options = self.options
+                if imp.imported is not None:
+                    imp.imported.options = self.options
         self.wsdl = wsdl
         return wsdl
 
+    async def __singleflight(self, cache, id, url, headers):
+        """
+        Load a WSDL not found in the cache, sharing a single load between
+        concurrent open() calls for the same WSDL.
+
+        Loads are shared by readers fetching the WSDL the same way, i.e.
+        with the same HTTP headers, credentials, document store, plugins and
+        schema options, and all of them get the same WSDL object. Those using
+        another cache than the one it was loaded for add it to theirs.
+
+        """
+        key = self.__signature(url, headers)
+        loading = self.__loading.get(key)
+        if loading is None:
+            future = asyncio.ensure_future(self.__load(cache, id, url, headers))
+            self.__loading[key] = (future, cache)
+            future.add_done_callback(lambda f: self.__loading.pop(key, None))
+            return await asyncio.shield(future)
+        log.debug("waiting for WSDL at '%s' being loaded", url)
+        future, loaded = loading
+        wsdl = await asyncio.shield(future)
+        if cache is not loaded:
+            await cache.aput(id, wsdl)
+        return wsdl
+
+    def __signature(self, url, headers):
+        """
+        Get what loading a WSDL depends on.
+
+        @param url: A WSDL URL.
+        @type url: str
+        @param headers: The HTTP headers used.
+        @type headers: dict
+        @return: A hashable signature.
+        @rtype: tuple
+
+        """
+        options = self.options
+        transport = options.transport
+        credentials = getattr(transport, "credentials", None)
+        return (
+            asyncio.get_event_loop(),
+            url,
+            tuple(sorted((headers or {}).items())),
+            type(transport),
+            credentials and credentials(),
+            self.verify_ssl,
+            str(self.proxy),
+            options.documentStore,
+            tuple(options.plugins),
+            options.doctor,
+            options.autoblend,
+            options.unwrap,
+            options.parser,
+        )
+
+    async def __load(self, cache, id, url, headers):
+        wsdl = self.fn(url, self.options, headers=headers)
+        wsdl.verify_ssl = self.verify_ssl
+        wsdl.proxy = self.proxy
+        await wsdl.connect()
+        await cache.aput(id, wsdl)
+        return wsdl
+
     def __cache(self):
         """
         Get the I{object cache}.
@@ -134,10 +216,10 @@ class DocumentReader(Reader):
         cache = self.__cache()
         id = self.mangle(url, "document")
         self.headers = headers or {}
-        xml = cache.get(id)
+        xml = yield from cache.aget(id)
         if xml is None:
             xml = yield from self.__fetch(url)
-            cache.put(id, xml)
+            yield from cache.aput(id, xml)
         self.plugins.document.parsed(url=url, document=xml.root())
         return xml
 
@@ -182,5 +264,95 @@ class DocumentReader(Reader):
             content = yield from self.options.transport.open(request)
         ctx = self.plugins.document.loaded(url=url, document=content)
         content = ctx.document
-        sax = asyncsuds.sax.parser.Parser()
+        sax = asyncsuds.sax.parser.Parser(self.options.parser)
         return sax.parse(string=content)
+
+
+class DocumentLoader(Reader):
+    """
+    Fetches XML documents concurrently.
+
+    At most I{limit} documents are fetched at a time and each URL is fetched
+    only once per loader, no matter how often it gets opened.
+
+    @ivar limit: The maximum number of concurrent fetches.
+    @type limit: int
+
+    """
+
+    def __init__(self, options):
+        """
+        @param options: An options object.
+        @type options: I{Options}
+
+        """
+        super(DocumentLoader, self).__init__(options)
+        self.limit = options.fetchlimit
+        self.__documents = {}
+        self.__semaphore = None
+
+    def open(self, url):
+        """
+        Get the (future) document at the specified URL.
+
+        @param url: A document URL.
+        @type url: str
+        @return: An awaitable returning the document.
+        @rtype: I{asyncio.Future}
+
+        """
+        future = self.__documents.get(url)
+        if future is None:
+            future = asyncio.ensure_future(self.__fetch(url))
+            self.__documents[url] = future
+        return future
+
+    async def prefetch(self, urls):
+        """
+        Fetch the documents at the specified URLs and, transitively, all the
+        documents they reference.
+
+        Fetch errors are not raised here but when the failed document gets
+        opened.
+
+        @param urls: Document URLs.
+        @type urls: [str,...]
+
+        """
+        pending = {}
+        for url in urls:
+            pending[self.open(url)] = url
+        while pending:
+            done, _ = await asyncio.wait(
+                list(pending), return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                url = pending.pop(future)
+                if future.cancelled() or future.exception() is not None:
+                    continue
+                for ref in self.references(url, future.result()):
+                    if ref not in self.__documents:
+                        pending[self.open(ref)] = ref
+
+    def references(self, url, document):
+        """
+        Get the URLs of the documents referenced by a fetched document.
+
+        @param url: The document URL.
+        @type url: str
+        @param document: The fetched document.
+        @type document: I{Document}
+        @return: The absolute URLs of referenced documents.
+        @rtype: [str,...]
+
+        """
+        return []
+
+    async def __fetch(self, url):
+        if self.__semaphore is None:
+            self.__semaphore = asyncio.Semaphore(self.limit)
+        async with self.__semaphore:
+            reader = DocumentReader(self.options)
+            reader.verify_ssl = self.verify_ssl
+            reader.proxy = self.proxy
+            return await reader.open(url)
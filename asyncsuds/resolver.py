@@ -376,6 +376,9 @@ class GraphResolver(TreeResolver):
     used to resolve each node in a tree.  As such, it mirrors
     the tree structure to ensure that nodes are resolved in
     context.
+    @ivar found: The children found, by (parent, name). Kept across
+        resets since the schema does not change.
+    @type found: dict
     """
 
     def __init__(self, schema):
@@ -384,6 +387,7 @@ class GraphResolver(TreeResolver):
         @type schema: L{xsd.schema.Schema}
         """
         TreeResolver.__init__(self, schema)
+        self.found = {}
 
     def find(self, name, object, resolved=False, push=True):
         """
@@ -433,6 +437,14 @@ class GraphResolver(TreeResolver):
         result = query.execute(schema)
         return (result, [])
 
+    def getchild(self, name, parent):
+        key = (parent, name)
+        found = self.found.get(key)
+        if found is None:
+            found = TreeResolver.getchild(self, name, parent)
+            self.found[key] = found
+        return found
+
     def wsdl(self):
         """Get the wsdl."""
         container = self.schema.container
@@ -12,6 +12,8 @@ prefix and the URI, e.g. I{('tns', 'http://myns')}
 @type encoder: L{Encoder}
 """
 
+import sys
+
 from asyncsuds.sax.enc import Encoder
 
 #
@@ -34,6 +36,20 @@ def splitPrefix(name):
     return None, name
 
 
+def intern(s):
+    """
+    Intern a string so that the many equal tag names, prefixes and namespace
+    URIs in a document share a single string object.
+    @param s: A string (or None).
+    @type s: basestring
+    @return: The interned string, or I{s} when not a plain string.
+    @rtype: basestring
+    """
+    if type(s) is str:
+        return sys.intern(s)
+    return s
+
+
 class Namespace:
     """
     The namespace class represents XML namespaces.
@@ -20,6 +20,8 @@ class Attribute(object):
     @type value: basestring
     """
 
+    __slots__ = ("parent", "prefix", "name", "value")
+
     def __init__(self, name, value=None):
         """
         @param name: The attribute's name with I{optional} namespace prefix.
@@ -28,7 +30,10 @@ class Attribute(object):
         @type value: basestring
         """
         self.parent = None
-        self.prefix, self.name = splitPrefix(name)
+        prefix, name = splitPrefix(name)
+        if prefix is not None:
+            prefix, name = intern(prefix), intern(name)
+        self.prefix, self.name = prefix, name
         self.setValue(value)
 
     def clone(self, parent=None):
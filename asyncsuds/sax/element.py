@@ -3,6 +3,8 @@ XML I{element} classes.
 
 """
 
+from types import MappingProxyType
+
 from asyncsuds import *
 from asyncsuds.sax import *
 from asyncsuds.sax.attribute import Attribute
@@ -13,6 +15,12 @@ class Element(object):
     """
     An XML element object.
 
+    Elements use slots and share read-only empty I{nsprefixes} and
+    I{attributes} until first accessed, so that the many nodes of large
+    documents without namespace declarations or attributes stay small. Code
+    only reading them may use I{_nsprefixes} and I{_attributes}, which do not
+    allocate.
+
     @ivar parent: The node containing this attribute.
     @type parent: L{Element}
     @ivar prefix: The I{optional} namespace prefix.
@@ -31,9 +39,25 @@ class Element(object):
     @type children: [I{Element},...]
     @cvar matcher: A collection of I{lambda} for string matching.
     @cvar specialprefixes: A dictionary of builtin-special prefixes.
+    @cvar indexed: The number of children from which child lookups by name
+        use an index, built on first lookup.
+    @type indexed: int
 
     """
 
+    __slots__ = (
+        "prefix",
+        "_name",
+        "expns",
+        "text",
+        "parent",
+        "children",
+        "_nsprefixes",
+        "_attributes",
+        "__index",
+        "__scope",
+    )
+
     matcher = {
         "eq": lambda a, b: a == b,
         "startswith": lambda a, b: a.startswith(b),
@@ -43,6 +67,11 @@ class Element(object):
 
     specialprefixes = {Namespace.xmlns[0]: Namespace.xmlns[1]}
 
+    indexed = 16
+
+    __noprefixes = MappingProxyType({})
+    __noattributes = ()
+
     @classmethod
     def buildPath(self, parent, path):
         """
@@ -75,17 +104,73 @@ class Element(object):
         @type ns: (I{prefix}, I{name})
 
         """
+        self.parent = None
         self.rename(name)
         self.expns = None
-        self.nsprefixes = {}
-        self.attributes = []
+        self._nsprefixes = self.__noprefixes
+        self._attributes = self.__noattributes
         self.text = None
+        self.__index = None
+        self.__scope = None
         if parent is not None and not isinstance(parent, Element):
             raise Exception("parent (%s) not-valid" % (parent.__class__.__name__,))
         self.parent = parent
         self.children = []
         self.applyns(ns)
 
+    @property
+    def nsprefixes(self):
+        """
+        The mapping of prefixes to namespaces declared on this element.
+
+        @rtype: dict
+
+        """
+        nsprefixes = self._nsprefixes
+        if nsprefixes is self.__noprefixes:
+            nsprefixes = self._nsprefixes = _Prefixes(self)
+        return nsprefixes
+
+    @nsprefixes.setter
+    def nsprefixes(self, nsprefixes):
+        self._nsprefixes = _Prefixes(self, nsprefixes)
+        self._changed()
+
+    @property
+    def name(self):
+        """
+        The I{unqualified} name of the element. Setting it drops the parent's
+        index of children by name.
+
+        @rtype: basestring
+
+        """
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        self._name = name
+        parent = self.parent
+        if parent is not None:
+            parent.__index = None
+
+    @property
+    def attributes(self):
+        """
+        The list of XML attributes.
+
+        @rtype: [I{Attribute},...]
+
+        """
+        attributes = self._attributes
+        if attributes is self.__noattributes:
+            attributes = self._attributes = []
+        return attributes
+
+    @attributes.setter
+    def attributes(self, attributes):
+        self._attributes = attributes
+
     def rename(self, name):
         """
         Rename the element.
@@ -96,7 +181,10 @@ class Element(object):
         """
         if name is None:
             raise Exception("name (%s) not-valid" % (name,))
-        self.prefix, self.name = splitPrefix(name)
+        prefix, name = splitPrefix(name)
+        if prefix is not None:
+            prefix, name = intern(prefix), intern(name)
+        self.prefix, self.name = prefix, name
 
     def setPrefix(self, p, u=None):
         """
@@ -151,11 +239,12 @@ class Element(object):
 
         """
         root = Element(self.qname(), parent, self.namespace())
-        for a in self.attributes:
+        root.text = self.text
+        for a in self._attributes:
             root.append(a.clone(self))
         for c in self.children:
             root.append(c.clone(self))
-        for ns in self.nsprefixes.items():
+        for ns in self._nsprefixes.items():
             root.addPrefix(ns[0], ns[1])
         return root
 
@@ -169,9 +258,14 @@ class Element(object):
 
         """
         if self.parent is not None:
-            if self in self.parent.children:
-                self.parent.children.remove(self)
+            children = self.parent.children
+            for i, c in enumerate(children):
+                if c is self:
+                    del children[i]
+                    break
+            self.parent.__index = None
             self.parent = None
+            self._changed()
         return self
 
     def set(self, name, value):
@@ -330,6 +424,8 @@ class Element(object):
             if isinstance(child, Element):
                 self.children.append(child)
                 child.parent = self
+                self.__index = None
+                child._changed()
                 continue
             if isinstance(child, Attribute):
                 self.attributes.append(child)
@@ -357,6 +453,8 @@ class Element(object):
                 raise Exception("append %s not-valid" % (child.__class__.__name__,))
             self.children.insert(index, child)
             child.parent = self
+            child._changed()
+        self.__index = None
         return self
 
     def remove(self, child):
@@ -384,16 +482,20 @@ class Element(object):
         @type content: L{Element} or [L{Element},...]
 
         """
-        if child not in self.children:
+        for index, c in enumerate(self.children):
+            if c is child:
+                break
+        else:
             raise Exception("child not-found")
-        index = self.children.index(child)
         self.remove(child)
         if not isinstance(content, (list, tuple)):
             content = (content,)
         for node in content:
             self.children.insert(index, node.detach())
             node.parent = self
+            node._changed()
             index += 1
+        self.__index = None
 
     def getAttribute(self, name, ns=None, default=None):
         """
@@ -413,7 +515,7 @@ class Element(object):
             prefix, name = splitPrefix(name)
             if prefix is not None:
                 ns = self.resolvePrefix(prefix)
-        for a in self.attributes:
+        for a in self._attributes:
             if a.match(name, ns):
                 return a
         return default
@@ -436,7 +538,7 @@ class Element(object):
             prefix, name = splitPrefix(name)
             if prefix is not None:
                 ns = self.resolvePrefix(prefix)
-        for c in self.children:
+        for c in self.__named(name):
             if c.match(name, ns):
                 return c
         return default
@@ -501,7 +603,7 @@ class Element(object):
             prefix, name = splitPrefix(name)
             if prefix is not None:
                 ns = self.resolvePrefix(prefix)
-        return [c for c in self.children if c.match(name, ns)]
+        return [c for c in self.__named(name) if c.match(name, ns)]
 
     def detachChildren(self):
         """
@@ -513,16 +615,22 @@ class Element(object):
         """
         detached = self.children
         self.children = []
+        self.__index = None
         for child in detached:
             child.parent = None
+            child._changed()
         return detached
 
     def resolvePrefix(self, prefix, default=Namespace.default):
         """
         Resolve the specified prefix to a namespace. The I{nsprefixes} is
-        searched. If not found, walk up the tree until either resolved or the
-        top of the tree is reached. Searching up the tree provides for
-        inherited mappings.
+        searched. If not found, the mappings inherited from the ancestors are
+        searched until either resolved or the top of the tree is reached.
+
+        The inherited mappings are looked up in the parent's cached prefix
+        scope once it has been asked for more than once since the tree last
+        changed, so repeated lookups in deep documents do not walk up the
+        tree.
 
         @param prefix: A namespace prefix to resolve.
         @type prefix: basestring
@@ -533,12 +641,22 @@ class Element(object):
         @rtype: (I{prefix}, I{URI})
 
         """
-        n = self
+        nsprefixes = self._nsprefixes
+        if prefix in nsprefixes:
+            return prefix, nsprefixes[prefix]
+        if prefix in self.specialprefixes:
+            return prefix, self.specialprefixes[prefix]
+        n = self.parent
+        if n is None:
+            return default
+        scope = n.__prefixscope()
+        if scope is not None:
+            if prefix in scope:
+                return prefix, scope[prefix]
+            return default
         while n is not None:
-            if prefix in n.nsprefixes:
-                return prefix, n.nsprefixes[prefix]
-            if prefix in self.specialprefixes:
-                return prefix, self.specialprefixes[prefix]
+            if prefix in n._nsprefixes:
+                return prefix, n._nsprefixes[prefix]
             n = n.parent
         return default
 
@@ -569,8 +687,8 @@ class Element(object):
         @note: This method traverses down the entire branch!
 
         """
-        if p in self.nsprefixes:
-            self.nsprefixes[p] = u
+        if p in self._nsprefixes:
+            self._nsprefixes[p] = u
         for c in self.children:
             c.updatePrefix(p, u)
         return self
@@ -585,8 +703,8 @@ class Element(object):
         @rtype: L{Element}
 
         """
-        if prefix in self.nsprefixes:
-            del self.nsprefixes[prefix]
+        if prefix in self._nsprefixes:
+            del self._nsprefixes[prefix]
         return self
 
     def findPrefix(self, uri, default=None):
@@ -604,7 +722,7 @@ class Element(object):
         @rtype: basestring
 
         """
-        for item in self.nsprefixes.items():
+        for item in self._nsprefixes.items():
             if item[1] == uri:
                 return item[0]
         for item in self.specialprefixes.items():
@@ -630,7 +748,7 @@ class Element(object):
 
         """
         result = []
-        for item in self.nsprefixes.items():
+        for item in self._nsprefixes.items():
             if self.matcher[match](item[1], uri):
                 prefix = item[0]
                 result.append(prefix)
@@ -658,15 +776,15 @@ class Element(object):
             c.promotePrefixes()
         if self.parent is None:
             return
-        for p, u in self.nsprefixes.copy().items():
-            if p in self.parent.nsprefixes:
-                pu = self.parent.nsprefixes[p]
+        for p, u in self._nsprefixes.copy().items():
+            if p in self.parent._nsprefixes:
+                pu = self.parent._nsprefixes[p]
                 if pu == u:
-                    del self.nsprefixes[p]
+                    del self._nsprefixes[p]
                 continue
             if p != self.parent.prefix:
                 self.parent.nsprefixes[p] = u
-                del self.nsprefixes[p]
+                del self._nsprefixes[p]
         return self
 
     def refitPrefixes(self):
@@ -685,7 +803,8 @@ class Element(object):
             if ns[1] is not None:
                 self.expns = ns[1]
         self.prefix = None
-        self.nsprefixes = {}
+        self._nsprefixes = self.__noprefixes
+        self._changed()
         return self
 
     def normalizePrefixes(self):
@@ -718,7 +837,7 @@ class Element(object):
         nocontent = nochildren and notext
         if content:
             return nocontent
-        noattrs = not len(self.attributes)
+        noattrs = not len(self._attributes)
         return nocontent and noattrs
 
     def isnil(self):
@@ -788,7 +907,7 @@ class Element(object):
         result = []
         result.append("%s<%s" % (tab, self.qname()))
         result.append(self.nsdeclarations())
-        for a in self.attributes:
+        for a in self._attributes:
             result.append(" %s" % (str(a),))
         if self.isempty():
             result.append("/>")
@@ -813,7 +932,7 @@ class Element(object):
 
         """
         result = ["<%s" % (self.qname(),), self.nsdeclarations()]
-        for a in self.attributes:
+        for a in self._attributes:
             result.append(" %s" % (str(a),))
         if self.isempty():
             result.append("/>")
@@ -844,7 +963,7 @@ class Element(object):
         if myns[1] != pns[1]:
             if self.expns is not None:
                 s.append(' xmlns="%s"' % (self.expns,))
-        for item in self.nsprefixes.items():
+        for item in self._nsprefixes.items():
             p, u = item
             if self.parent is not None:
                 ns = self.parent.resolvePrefix(p)
@@ -921,6 +1040,96 @@ class Element(object):
                 pruned.append(c)
         for p in pruned:
             self.children.remove(p)
+        self.__index = None
+
+    def __named(self, name):
+        """
+        Get the children that may be named I{name}, in document order.
+
+        Elements with enough children index them by name, the index being
+        dropped when children are added, removed or renamed, including by
+        setting their I{name}. It is also
+        rebuilt when the list of children is replaced or changes size, so
+        children appended to it directly are found as well.
+
+        @param name: A child element name (None matches all).
+        @type name: basestring
+        @return: The candidate children.
+        @rtype: [L{Element},...]
+
+        """
+        children = self.children
+        if name is None or len(children) < self.indexed:
+            return children
+        index = self.__index
+        if index is None or index[0] is not children or index[1] != len(children):
+            named = {}
+            for c in children:
+                named.setdefault(c._name, []).append(c)
+            index = (children, len(children), named)
+            self.__index = index
+        return index[2].get(name, ())
+
+    def __prefixscope(self):
+        """
+        Get the prefix mappings in scope for this element: its own mappings
+        overlaid on the ones inherited from its ancestors.
+
+        Scopes are cached per element together with the token of the tree
+        they were built in, and are valid until that token is bumped by a
+        change to the tree (see L{_changed}). A scope is only built when asked
+        for a second time without such a change, so trees that are still being
+        built and changed between lookups do not pay for scopes that are
+        never reused.
+
+        @return: The mappings in scope, or None when not (yet) cached.
+        @rtype: dict
+
+        """
+        cached = self.__scope
+        if cached is None:
+            self.__scope = (None, 0, None)
+            return None
+        token, count, scope = cached
+        if token is not None and token[0] != count:
+            self.__scope = (token, token[0], None)
+            return None
+        if scope is not None:
+            return scope
+        chain = []
+        scope = {}
+        token = None
+        n = self
+        while n is not None:
+            cached = n.__scope
+            if cached is not None and cached[2] is not None:
+                if cached[0][0] == cached[1]:
+                    token, scope = cached[0], cached[2]
+                    break
+            chain.append(n)
+            n = n.parent
+        if token is None:
+            token = [0]
+        count = token[0]
+        for n in reversed(chain):
+            if n._nsprefixes:
+                scope = dict(scope)
+                scope.update(n._nsprefixes)
+            n.__scope = (token, count, scope)
+        return scope
+
+    def _changed(self):
+        """
+        Invalidate the cached prefix scopes of this element's tree after its
+        prefix mappings or its place in the tree changed.
+
+        The scopes of a tree share a token, so this leaves the cached scopes
+        of other trees alone.
+
+        """
+        cached = self.__scope
+        if cached is not None and cached[0] is not None:
+            cached[0][0] += 1
 
     def __childrenAtPath(self, parts):
         result = []
@@ -959,6 +1168,33 @@ class Element(object):
         else:
             if index < len(self.children) and isinstance(value, Element):
                 self.children.insert(index, value)
+                self.__index = None
+                value._changed()
+
+    def __getstate__(self):
+        state = dict(
+            prefix=self.prefix,
+            name=self.name,
+            expns=self.expns,
+            text=self.text,
+            parent=self.parent,
+            children=self.children,
+        )
+        if self._nsprefixes:
+            state["nsprefixes"] = self._nsprefixes
+        if self._attributes:
+            state["attributes"] = self._attributes
+        state.update(getattr(self, "__dict__", {}))
+        return state
+
+    def __setstate__(self, state):
+        self.parent = None
+        self._nsprefixes = self.__noprefixes
+        self._attributes = self.__noattributes
+        self.__index = None
+        self.__scope = None
+        for name, value in state.items():
+            setattr(self, name, value)
 
     def __eq__(self, rhs):
         return isinstance(rhs, Element) and self.match(rhs.name, rhs.namespace())
@@ -973,6 +1209,62 @@ class Element(object):
         return NodeIterator(self)
 
 
+class _Prefixes(dict):
+    """
+    The prefix mappings declared on an element, which invalidate the cached
+    prefix scopes of the element's tree when changed.
+
+    @ivar element: The element declaring the mappings.
+    @type element: L{Element}
+
+    """
+
+    __slots__ = ("element",)
+
+    def __init__(self, element, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self.element = element
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self.element._changed()
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self.element._changed()
+
+    def __ior__(self, other):
+        dict.update(self, other)
+        self.element._changed()
+        return self
+
+    def clear(self):
+        dict.clear(self)
+        self.element._changed()
+
+    def pop(self, *args):
+        value = dict.pop(self, *args)
+        self.element._changed()
+        return value
+
+    def popitem(self):
+        item = dict.popitem(self)
+        self.element._changed()
+        return item
+
+    def setdefault(self, key, default=None):
+        value = dict.setdefault(self, key, default)
+        self.element._changed()
+        return value
+
+    def update(self, *args, **kwargs):
+        dict.update(self, *args, **kwargs)
+        self.element._changed()
+
+
 class NodeIterator:
     """
     The L{Element} child node iterator.
@@ -10,6 +10,9 @@ class Encoder:
     """
     An XML special character encoder/decoder.
 
+    The encodings are compiled once, literal ones into plain string
+    replacements.
+
     @cvar encodings: A mapping of special characters encoding.
     @type encodings: [(str, str),...]
     @cvar decodings: A mapping of special characters decoding.
@@ -35,6 +38,9 @@ class Encoder:
     )
     special = ("&", "<", ">", '"', "'")
 
+    def __init__(self):
+        self.__encodings = [self.compile(p, r) for p, r in self.encodings]
+
     def encode(self, s):
         """
         Encode special characters found in string I{s}.
@@ -46,8 +52,8 @@ class Encoder:
 
         """
         if isinstance(s, str) and self.__needs_encoding(s):
-            for x in self.encodings:
-                s = re.sub(x[0], x[1], s)
+            for encoding in self.__encodings:
+                s = encoding(s)
         return s
 
     def decode(self, s):
@@ -65,6 +71,28 @@ class Encoder:
                 s = s.replace(x[0], x[1])
         return s
 
+    @staticmethod
+    def compile(pattern, replacement):
+        """
+        Compile an encoding into a function applying it to a string.
+
+        Literal patterns are replaced using I{str.replace()}, which is much
+        faster than a regular expression substitution, and the others use a
+        precompiled regular expression.
+
+        @param pattern: The pattern to replace.
+        @type pattern: str
+        @param replacement: The replacement.
+        @type replacement: str
+        @return: The encoding function.
+        @rtype: callable
+
+        """
+        if re.escape(pattern) == pattern and "\\" not in replacement:
+            return lambda s: s.replace(pattern, replacement)
+        regex = re.compile(pattern)
+        return lambda s: regex.sub(replacement, s)
+
     def __needs_encoding(self, s):
         """
         Get whether string I{s} contains special characters.
@@ -75,7 +103,7 @@ class Encoder:
         @rtype: boolean
 
         """
-        if isinstance(s, str):
-            for c in self.special:
-                if c in s:
-                    return True
+        for c in self.special:
+            if c in s:
+                return True
+        return False
@@ -10,24 +10,36 @@ prefix and the URI, e.g. I{('tns', 'http://myns')}.
 
 """
 
-from io import StringIO
+from logging import getLogger
+from xml.parsers import expat
 from xml.sax import ContentHandler
-from xml.sax import InputSource
 from xml.sax import make_parser
 from xml.sax.handler import feature_external_ges
 
 import asyncsuds
+import asyncsuds.metrics
+from asyncsuds.sax import Namespace
+from asyncsuds.sax import intern
 from asyncsuds.sax.attribute import Attribute
 from asyncsuds.sax.document import Document
 from asyncsuds.sax.element import Element
 from asyncsuds.sax.text import Text
 
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+
+log = getLogger(__name__)
+
 
 class Handler(ContentHandler):
     """SAX handler."""
 
     def __init__(self):
         self.nodes = [Document()]
+        self.buffers = []
 
     def startElement(self, name, attrs):
         top = self.top()
@@ -39,18 +51,18 @@ class Handler(ContentHandler):
             if self.mapPrefix(node, attribute):
                 continue
             node.append(attribute)
-        node.charbuffer = []
         top.append(node)
         self.push(node)
+        self.buffers.append([])
 
     def mapPrefix(self, node, attribute):
         if attribute.name == "xmlns":
             if len(attribute.value):
-                node.expns = str(attribute.value)
+                node.expns = intern(str(attribute.value))
             return True
         if attribute.prefix == "xmlns":
             prefix = attribute.name
-            node.nsprefixes[prefix] = str(attribute.value)
+            node.nsprefixes[prefix] = intern(str(attribute.value))
             return True
         return False
 
@@ -59,16 +71,15 @@ class Handler(ContentHandler):
         current = self.pop()
         if name != current.qname():
             raise Exception("malformed document")
-        if current.charbuffer:
-            current.text = Text(u"".join(current.charbuffer))
-        del current.charbuffer
+        buffer = self.buffers.pop()
+        if buffer:
+            current.text = Text("".join(buffer))
         if current:
             current.trim()
 
     def characters(self, content):
         text = str(content)
-        node = self.top()
-        node.charbuffer.append(text)
+        self.buffers[-1].append(text)
 
     def push(self, node):
         self.nodes.append(node)
@@ -81,8 +92,201 @@ class Handler(ContentHandler):
         return self.nodes[-1]
 
 
+class SaxBuilder:
+    """Builds documents using the standard library SAX parser."""
+
+    def __init__(self):
+        self.sax, self.handler = Parser.saxparser()
+
+    def feed(self, data):
+        self.sax.feed(data)
+
+    def close(self):
+        self.sax.close()
+        return self.handler.nodes[0]
+
+
+class ExpatBuilder:
+    """
+    Builds documents using the expat parser directly, skipping the SAX
+    layer and its per-callback overhead.
+
+    """
+
+    def __init__(self):
+        self.document = Document()
+        self.nodes = []
+        self.buffers = []
+        p = expat.ParserCreate()
+        p.buffer_text = True
+        p.ordered_attributes = True
+        p.StartElementHandler = self.start
+        p.EndElementHandler = self.end
+        p.CharacterDataHandler = self.characters
+        self.expat = p
+
+    def feed(self, data):
+        self.expat.Parse(data, False)
+
+    def close(self):
+        self.expat.Parse(b"", True)
+        return self.document
+
+    def start(self, name, attrs):
+        node = self.element(name, attrs)
+        if self.nodes:
+            parent = self.nodes[-1]
+            parent.children.append(node)
+            node.parent = parent
+        else:
+            self.document.append(node)
+        self.nodes.append(node)
+        self.buffers.append([])
+
+    def end(self, name):
+        node = self.nodes.pop()
+        buffer = self.buffers.pop()
+        if buffer:
+            node.text = Text("".join(buffer))
+        if node.children:
+            node.trim()
+
+    def characters(self, content):
+        self.buffers[-1].append(content)
+
+    @staticmethod
+    def element(name, attrs):
+        """
+        Create an element from expat start tag data.
+
+        @param name: The tag name.
+        @type name: str
+        @param attrs: The attribute names and values, in order.
+        @type attrs: [str,...]
+        @return: A new (unparented) element.
+        @rtype: L{Element}
+
+        """
+        node = Element(name)
+        for i in range(0, len(attrs), 2):
+            name, value = attrs[i], attrs[i + 1]
+            if name == "xmlns":
+                if value:
+                    node.expns = intern(value)
+                continue
+            if name.startswith("xmlns:"):
+                node.nsprefixes[intern(name[6:])] = intern(value)
+                continue
+            attribute = Attribute(name, value)
+            attribute.parent = node
+            node.attributes.append(attribute)
+        return node
+
+
+class LxmlBuilder:
+    """Builds documents using the lxml pull parser."""
+
+    def __init__(self):
+        self.document = Document()
+        self.nodes = []
+        self.namespaces = []
+        self.lxml = etree.XMLPullParser(
+            events=("start-ns", "start", "end"), resolve_entities=False
+        )
+
+    def feed(self, data):
+        self.lxml.feed(data)
+        self.read()
+
+    def close(self):
+        self.lxml.close()
+        self.read()
+        return self.document
+
+    def read(self):
+        for event, item in self.lxml.read_events():
+            if event == "start-ns":
+                self.namespaces.append(item)
+            elif event == "start":
+                self.start(item)
+            else:
+                self.end(item)
+
+    def start(self, item):
+        node = Element(self.qname(item, item.tag, item.prefix))
+        for prefix, uri in self.namespaces:
+            if prefix:
+                node.nsprefixes[intern(prefix)] = intern(uri)
+            elif uri:
+                node.expns = intern(uri)
+        self.namespaces = []
+        for name, value in item.attrib.items():
+            attribute = Attribute(self.qname(item, name), value)
+            attribute.parent = node
+            node.attributes.append(attribute)
+        if self.nodes:
+            parent = self.nodes[-1]
+            parent.children.append(node)
+            node.parent = parent
+        else:
+            self.document.append(node)
+        self.nodes.append(node)
+
+    def end(self, item):
+        node = self.nodes.pop()
+        text = [item.text or ""]
+        text.extend(child.tail or "" for child in item)
+        text = "".join(text)
+        if text:
+            node.text = Text(text)
+        if node.children:
+            node.trim()
+        item.clear(keep_tail=True)
+
+    @staticmethod
+    def qname(item, name, prefix=None):
+        if name[0] != "{":
+            return name
+        uri, name = name[1:].split("}", 1)
+        if prefix is None:
+            if uri == Namespace.xmlns[1]:
+                prefix = Namespace.xmlns[0]
+            else:
+                for p, u in item.nsmap.items():
+                    if p and u == uri:
+                        prefix = p
+                        break
+        if prefix is None:
+            return name
+        return "%s:%s" % (prefix, name)
+
+
 class Parser:
-    """SAX parser."""
+    """
+    XML parser.
+
+    @cvar builders: Document builders by backend name.
+    @type builders: dict
+    @ivar backend: The parser backend used.
+    @type backend: str
+
+    """
+
+    builders = {"sax": SaxBuilder, "expat": ExpatBuilder, "lxml": LxmlBuilder}
+
+    def __init__(self, backend="sax"):
+        """
+        @param backend: The parser backend: I{sax}, I{expat} or I{lxml}.
+            I{lxml} falls back to I{expat} when lxml is not installed.
+        @type backend: str
+
+        """
+        if backend not in self.builders:
+            raise Exception("parser backend (%s) not-valid" % (backend,))
+        if backend == "lxml" and etree is None:
+            log.debug("lxml not installed, using expat")
+            backend = "expat"
+        self.backend = backend
 
     @classmethod
     def saxparser(cls):
@@ -92,14 +296,26 @@ class Parser:
         p.setContentHandler(h)
         return p, h
 
+    def builder(self):
+        """
+        Get a new incremental document builder for the parser backend.
+
+        @return: A builder, parsing the content passed to its I{feed()} and
+            returning the document from its I{close()}.
+        @rtype: L{SaxBuilder}|L{ExpatBuilder}|L{LxmlBuilder}
+
+        """
+        return self.builders[self.backend]()
+
     def parse(self, file=None, string=None):
         """
-        SAX parse XML text.
+        Parse XML text.
 
         @param file: Parse a python I{file-like} object.
         @type file: I{file-like} object
-        @param string: Parse string XML.
-        @type string: str
+        @param string: Parse XML content. Raw content (bytes) is decoded as
+            specified by its XML declaration.
+        @type string: bytes|memoryview|str
         @return: Parsed XML document.
         @rtype: L{Document}
 
@@ -108,15 +324,66 @@ class Parser:
             return
         timer = asyncsuds.metrics.Timer()
         timer.start()
-        source = file
+        builder = self.builder()
         if file is None:
-            source = InputSource(None)
-            source.setByteStream(StringIO(string))
-        sax, handler = self.saxparser()
-        sax.parse(source)
+            builder.feed(string)
+        else:
+            while True:
+                data = file.read(65536)
+                if not data:
+                    break
+                builder.feed(data)
+        document = builder.close()
         timer.stop()
         if file is None:
-            asyncsuds.metrics.log.debug("%s\nsax duration: %s", string, timer)
+            asyncsuds.metrics.log.debug(
+                "%s\n%s duration: %s", string, self.backend, timer
+            )
         else:
-            asyncsuds.metrics.log.debug("sax (%s) duration: %s", file, timer)
-        return handler.nodes[0]
+            asyncsuds.metrics.log.debug(
+                "%s (%s) duration: %s", self.backend, file, timer
+            )
+        return document
+
+
+class StreamParser:
+    """
+    Incremental XML parser.
+
+    The document is built as data gets fed to the parser, so XML content
+    received in chunks need not be collected first.
+
+    """
+
+    def __init__(self, backend="sax"):
+        """
+        @param backend: The parser backend, see L{Parser}.
+        @type backend: str
+
+        """
+        self.builder = Parser(backend).builder()
+        self.empty = True
+
+    def feed(self, data):
+        """
+        Parse the next chunk of XML content.
+
+        @param data: A chunk of XML content.
+        @type data: bytes
+
+        """
+        if data:
+            self.empty = False
+            self.builder.feed(data)
+
+    def close(self):
+        """
+        Finish parsing.
+
+        @return: Parsed XML document or None if no content has been fed.
+        @rtype: L{Document}
+
+        """
+        if self.empty:
+            return
+        return self.builder.close()
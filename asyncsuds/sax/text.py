@@ -39,8 +39,9 @@ class Text(str):
         """
         if not self.escaped:
             post = sax.encoder.encode(self)
-            escaped = post != self
-            return Text(post, lang=self.lang, escaped=escaped)
+            if post is self:
+                return self
+            return Text(post, lang=self.lang, escaped=post != self)
         return self
 
     def unescape(self):
@@ -0,0 +1,130 @@
+"""
+Provides a writer serializing XML documents directly to bytes.
+"""
+
+from asyncsuds import sax
+from asyncsuds.sax.document import Document
+from asyncsuds.sax.element import Element
+from asyncsuds.sax.text import Text
+
+
+class Writer:
+    """
+    Serializes XML documents and elements to UTF-8 encoded bytes.
+
+    The output is the I{plain()} string representation, encoded. It is built
+    in a single buffer, without the string concatenation done by each
+    element, and namespace declarations are checked against the prefixes in
+    scope instead of being resolved up the parent chain for each node.
+    @ivar buffer: The text written so far.
+    @type buffer: [str,...]
+    """
+
+    def __init__(self):
+        self.buffer = []
+
+    def getvalue(self):
+        """
+        Get the text written so far.
+        @return: The UTF-8 encoded text.
+        @rtype: bytes
+        """
+        return "".join(self.buffer).encode("utf-8")
+
+    def write(self, node):
+        """
+        Write an XML document or element.
+        @param node: The node to write.
+        @type node: L{Document}|L{Element}
+        @return: self
+        @rtype: L{Writer}
+        """
+        if isinstance(node, Document):
+            self.buffer.append(node.DECL)
+            node = node.root()
+            if node is None:
+                return self
+        scope = {}
+        expns = None
+        parent = node.parent
+        if parent is not None:
+            expns = parent.expns
+            for ancestor in self.ancestry(parent):
+                scope.update(ancestor._nsprefixes)
+        self.element(node, parent, expns, scope)
+        return self
+
+    def element(self, node, parent, expns, scope):
+        """
+        Write an element.
+        @param node: The element to write.
+        @type node: L{Element}
+        @param parent: The element parent.
+        @type parent: L{Element}
+        @param expns: The parent default namespace.
+        @type expns: str
+        @param scope: The prefixes mapped by the parent and its ancestors.
+        @type scope: {prefix: URI}
+        """
+        append = self.buffer.append
+        if type(node).plain is not Element.plain:
+            append(node.plain())
+            return
+        qname = node.qname()
+        append("<")
+        append(qname)
+        if node.expns != expns and node.expns is not None:
+            append(' xmlns="%s"' % (node.expns,))
+        nsprefixes = node._nsprefixes
+        if nsprefixes:
+            for p, u in nsprefixes.items():
+                if parent is not None:
+                    if p in parent.specialprefixes:
+                        uri = parent._nsprefixes.get(p, parent.specialprefixes[p])
+                    else:
+                        uri = scope.get(p)
+                    if uri == u:
+                        continue
+                append(' xmlns:%s="%s"' % (p, u))
+            scope = dict(scope)
+            scope.update(nsprefixes)
+        for a in node._attributes:
+            value = a.value
+            if a.hasText():
+                value = value.escape()
+            append(' %s="%s"' % (a.qname(), value))
+        text = node.text
+        children = node.children
+        if not children and text is None:
+            append("/>")
+            return
+        append(">")
+        if text:
+            if isinstance(text, Text) and text.escaped:
+                append(text)
+            else:
+                append(sax.encoder.encode(text))
+        for child in children:
+            if child.parent is node:
+                self.element(child, node, node.expns, scope)
+            else:
+                append(child.plain())
+        append("</")
+        append(qname)
+        append(">")
+
+    @staticmethod
+    def ancestry(node):
+        """
+        Get an element and its ancestors, outermost first.
+        @param node: An element.
+        @type node: L{Element}
+        @return: The element ancestry.
+        @rtype: [L{Element},...]
+        """
+        result = []
+        while node is not None:
+            result.append(node)
+            node = node.parent
+        result.reverse()
+        return result
@@ -123,17 +123,54 @@ class Factory:
         return subclass(value)
 
 
+class Lazy:
+    """
+    A class attribute creating the value of an object attribute on first
+    access, stored in the object so later accesses find it directly.
+    @ivar name: The attribute name.
+    @type name: str
+    @ivar factory: A callable creating the value.
+    @type factory: callable
+    """
+
+    __slots__ = ("name", "factory")
+
+    def __init__(self, factory):
+        self.name = None
+        self.factory = factory
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, sobject, cls=None):
+        if sobject is None:
+            return self
+        value = self.factory()
+        sobject.__dict__[self.name] = value
+        return value
+
+
 class Object(object):
+    """
+    A suds object.
+
+    Attributes are listed in I{__keylist__} in the order first set. Since the
+    listed attributes are exactly the non-builtin ones in the object
+    dictionary, the dictionary is used to check for them. The printer and
+    metadata are only created when first used.
+    """
+
+    __printer__ = Lazy(lambda: Printer())
+    __metadata__ = Lazy(lambda: Metadata())
+
     def __init__(self):
         self.__keylist__ = []
-        self.__printer__ = Printer()
-        self.__metadata__ = Metadata()
 
     def __setattr__(self, name, value):
-        builtin = name.startswith("__") and name.endswith("__")
-        if not builtin and name not in self.__keylist__:
+        d = self.__dict__
+        if name not in d and not (name.startswith("__") and name.endswith("__")):
             self.__keylist__.append(name)
-        self.__dict__[name] = value
+        d[name] = value
 
     def __delattr__(self, name):
         try:
@@ -160,7 +197,9 @@ class Object(object):
         return len(self.__keylist__)
 
     def __contains__(self, name):
-        return name in self.__keylist__
+        if name in self.__dict__:
+            return not (name.startswith("__") and name.endswith("__"))
+        return False
 
     def __repr__(self):
         return str(self)
@@ -170,6 +209,9 @@ class Object(object):
 
 
 class Iter:
+
+    __slots__ = ("sobject", "keylist", "index")
+
     def __init__(self, sobject):
         self.sobject = sobject
         self.keylist = self.__keylist(sobject)
@@ -208,7 +250,6 @@ class Iter:
 class Metadata(Object):
     def __init__(self):
         self.__keylist__ = []
-        self.__printer__ = Printer()
 
 
 class Facade(Object):
@@ -239,6 +280,8 @@ class Property(Object):
 class Printer:
     """Pretty printing of a Object object."""
 
+    __slots__ = ()
+
     @classmethod
     def indent(cls, n):
         return "%*s" % (n * 3, " ")
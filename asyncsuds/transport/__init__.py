@@ -30,10 +30,15 @@ class Request(object):
     @type message: bytes|None
     @ivar headers: The HTTP headers to be used for the request.
     @type headers: dict
+    @ivar retry: The policy for retrying the request, None for a single
+        attempt.
+    @type retry: L{asyncsuds.transport.http_transport.RetryPolicy}
+    @ivar idempotent: The request may safely be sent more than once.
+    @type idempotent: bool
 
     """
 
-    def __init__(self, url, message=None, headers={}):
+    def __init__(self, url, message=None, headers=None):
         """
         Raised exception in case of detected non-ASCII URL characters may be
         either UnicodeEncodeError or UnicodeDecodeError, depending on the used
@@ -43,13 +48,17 @@ class Request(object):
         @type url: bytes|str|unicode
         @param message: The optional message to be sent in the request body.
         @type message: bytes|None
+        @param headers: The HTTP headers to be used for the request.
+        @type headers: dict|None
 
         """
         self.__set_URL(url)
-        self.headers = headers
+        self.headers = {} if headers is None else headers
         self.message = message
         self.verify_ssl = True
         self.proxy = None
+        self.retry = None
+        self.idempotent = False
 
     def __str__(self):
         result = [u"URL: %s\nHEADERS: %s" % (self.url, self.headers)]
@@ -129,8 +138,8 @@ class Transport(object):
 
         @param request: A transport request.
         @type request: L{Request}
-        @return: An input stream.
-        @rtype: stream
+        @return: The raw document content.
+        @rtype: bytes
         @raise TransportError: On all transport errors.
 
         """
@@ -147,9 +156,30 @@ class Transport(object):
 
         @param request: A transport request.
         @type request: L{Request}
-        @return: The reply
-        @rtype: L{Reply}
+        @return: The raw reply content.
+        @rtype: bytes
         @raise TransportError: On all transport errors.
 
         """
         raise Exception("not-implemented")
+
+    async def stream(self, request, feed):
+        """
+        Send SOAP message, passing the reply to I{feed} as it arrives.
+
+        By default, the complete reply returned by L{send()} is passed at once.
+
+        @param request: A transport request.
+        @type request: L{Request}
+        @param feed: Called with each received chunk of the reply.
+        @type feed: callable(bytes)
+        @raise TransportError: On all transport errors.
+
+        """
+        feed(await self.send(request))
+
+    async def close(self):
+        """
+        Release any resources (e.g. pooled connections) held by the transport.
+
+        """
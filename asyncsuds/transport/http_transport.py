@@ -3,23 +3,660 @@ Basic HTTP transport implementation classes.
 
 """
 
+import asyncio
 import base64
+import http.client
+import io
+import random
 import sys
+import time
+import weakref
+from collections import deque
 from http.cookiejar import CookieJar
 from logging import getLogger
+from urllib.parse import urlparse
 
 import aiohttp
 from asyncsuds.properties import Unskin
 from asyncsuds.transport import Transport
+from asyncsuds.transport import TransportError
 
 log = getLogger(__name__)
 
 
+class SessionPool:
+    """
+    A pool of long-lived aiohttp client sessions.
+
+    One session (and so one connection pool) is kept per event loop, since
+    aiohttp sessions may not be shared between loops. Sessions are created
+    lazily on first use and live until L{close()} is called.
+
+    @ivar limit: The total number of simultaneous connections (0=unlimited).
+    @type limit: int
+    @ivar limit_per_host: The number of simultaneous connections to a single
+        host (0=unlimited).
+    @type limit_per_host: int
+    @ivar keepalive_timeout: Idle keep-alive connections are closed after this
+        many seconds.
+    @type keepalive_timeout: float
+
+    """
+
+    def __init__(self, limit=100, limit_per_host=0, keepalive_timeout=15):
+        """
+        @param limit: The total number of simultaneous connections.
+        @type limit: int
+        @param limit_per_host: The number of simultaneous connections to a
+            single host.
+        @type limit_per_host: int
+        @param keepalive_timeout: The idle keep-alive connection expiry
+            (seconds).
+        @type keepalive_timeout: float
+
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.__sessions = weakref.WeakKeyDictionary()
+
+    def session(self, cookies=None):
+        """
+        Get the session for the running event loop, creating it if needed.
+
+        @param cookies: Cookies used when a new session gets created.
+        @type cookies: dict
+        @return: An open client session.
+        @rtype: I{aiohttp.ClientSession}
+
+        """
+        loop = asyncio.get_event_loop()
+        session = self.__sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            session = aiohttp.ClientSession(connector=connector, cookies=cookies)
+            self.__sessions[loop] = session
+            log.debug("pooled session created: %s", session)
+        return session
+
+    async def close(self):
+        """
+        Close the session of the running event loop.
+
+        Sessions bound to other (possibly already closed) loops can not be
+        closed from here and are simply dropped.
+
+        """
+        loop = asyncio.get_event_loop()
+        sessions = dict(self.__sessions)
+        self.__sessions.clear()
+        for owner, session in sessions.items():
+            if owner is loop and not session.closed:
+                await session.close()
+
+    def __len__(self):
+        return len(self.__sessions)
+
+
+class Limiter:
+    """
+    Limits the number of requests running at the same time, in total and to
+    each host.
+
+    Requests over the limits wait in a single first-in first-out queue and
+    are started in arrival order as soon as their host has a free slot, so
+    requests to a saturated host do not hold up requests to other hosts.
+    The limiter is shared by all clients using the same transport, or any
+    transports it is assigned to.
+
+    With I{adaptive} limits each host's limit is adjusted AIMD style: raised
+    by about one after each round of successful requests and halved (at most
+    once per average round trip) when a request fails with an HTTP 503
+    (service unavailable) reply or a timeout, or takes longer than
+    I{tolerance} times the host's average latency. Adaptive limits start at,
+    and never exceed, I{limit_per_host} or else I{limit}, or start at 10
+    when neither is set.
+
+    @ivar limit: The total number of requests running at the same time
+        (0=unlimited).
+    @type limit: int
+    @ivar limit_per_host: The number of requests running at the same time
+        to a single host (0=unlimited).
+    @type limit_per_host: int
+    @ivar adaptive: Adjust each host's limit to its observed behaviour.
+    @type adaptive: bool
+    @ivar tolerance: The latency, relative to the host's average, above
+        which adaptive limits get lowered.
+    @type tolerance: float
+    @ivar active: The number of requests running.
+    @type active: int
+    @ivar requests: The number of requests started.
+    @type requests: int
+    @ivar waited: The number of requests that had to wait.
+    @type waited: int
+    @ivar wait_time: The total time requests waited (seconds).
+    @type wait_time: float
+    @ivar max_wait_time: The longest time a request waited (seconds).
+    @type max_wait_time: float
+    @ivar max_waiting: The largest number of requests waiting at once.
+    @type max_waiting: int
+
+    """
+
+    def __init__(self, limit=0, limit_per_host=0, adaptive=False, tolerance=2.0):
+        """
+        @param limit: The total number of requests running at the same time.
+        @type limit: int
+        @param limit_per_host: The number of requests running at the same
+            time to a single host.
+        @type limit_per_host: int
+        @param adaptive: Adjust each host's limit to its observed behaviour.
+        @type adaptive: bool
+        @param tolerance: The relative latency lowering adaptive limits.
+        @type tolerance: float
+
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.adaptive = adaptive
+        self.tolerance = tolerance
+        self.active = 0
+        self.requests = 0
+        self.waited = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.max_waiting = 0
+        self.__hosts = {}
+        self.__queue = deque()
+
+    async def acquire(self, host):
+        """
+        Wait for a free slot for a request to a host.
+
+        @param host: The host (and port) the request is sent to.
+        @type host: str
+        @return: The host state to be passed to L{release()}.
+        @rtype: L{_Host}
+
+        """
+        state = self.__hosts.get(host)
+        if state is None:
+            state = self.__hosts[host] = _Host(host, self.__initial())
+        self.requests += 1
+        if self.__free(state):
+            self.__start(state)
+            return state
+        future = asyncio.get_event_loop().create_future()
+        waiter = (state, future)
+        self.__queue.append(waiter)
+        self.max_waiting = max(self.max_waiting, len(self.__queue))
+        started = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.cancelled():
+                self.__queue.remove(waiter)
+            else:
+                self.release(state)
+            raise
+        finally:
+            waited = time.monotonic() - started
+            self.waited += 1
+            self.wait_time += waited
+            self.max_wait_time = max(self.max_wait_time, waited)
+        return state
+
+    def release(self, state, latency=None, overloaded=False):
+        """
+        Release the slot of a finished request, starting waiting ones.
+
+        @param state: The host state returned by L{acquire()}.
+        @type state: L{_Host}
+        @param latency: The request duration (seconds), None when the request
+            did not complete.
+        @type latency: float
+        @param overloaded: The host reported being overloaded, i.e. replied
+            with HTTP 503 or timed out.
+        @type overloaded: bool
+
+        """
+        state.active -= 1
+        self.active -= 1
+        if self.adaptive and (overloaded or latency is not None):
+            self.__adapt(state, latency, overloaded)
+        self.__dispatch()
+
+    def stats(self):
+        """
+        Get the limiter statistics.
+
+        @return: The number of I{active}, I{waiting} and started
+            I{requests}, the number of requests that I{waited} and the
+            I{wait_time} totals, with the I{active} and I{waiting} requests
+            and the current I{limit} for each of the I{hosts}.
+        @rtype: dict
+
+        """
+        hosts = {}
+        for host, state in self.__hosts.items():
+            hosts[host] = dict(active=state.active, waiting=0, limit=state.limit)
+        for state, future in self.__queue:
+            hosts[state.host]["waiting"] += 1
+        return dict(
+            active=self.active,
+            waiting=len(self.__queue),
+            max_waiting=self.max_waiting,
+            requests=self.requests,
+            waited=self.waited,
+            wait_time=self.wait_time,
+            max_wait_time=self.max_wait_time,
+            hosts=hosts,
+        )
+
+    def __initial(self):
+        if self.adaptive:
+            return float(self.limit_per_host or self.limit or 10)
+        return self.limit_per_host
+
+    def __free(self, state):
+        if self.limit and self.active >= self.limit:
+            return False
+        return not state.limit or state.active + 1 <= state.limit
+
+    def __start(self, state):
+        state.active += 1
+        self.active += 1
+
+    def __dispatch(self):
+        waiting = deque()
+        for waiter in self.__queue:
+            state, future = waiter
+            if not future.done() and self.__free(state):
+                self.__start(state)
+                future.set_result(None)
+            else:
+                waiting.append(waiter)
+        self.__queue = waiting
+
+    def __adapt(self, state, latency, overloaded):
+        now = time.monotonic()
+        average = state.latency
+        if not overloaded:
+            overloaded = average and latency > self.tolerance * average
+            state.latency = latency if not average else 0.9 * average + 0.1 * latency
+        if overloaded:
+            if now - state.lowered >= average:
+                state.lowered = now
+                state.limit = max(1.0, state.limit / 2)
+                log.debug("request limit lowered to %d", state.limit)
+            return
+        state.limit += 1.0 / state.limit
+        ceiling = self.limit_per_host or self.limit
+        if ceiling:
+            state.limit = min(state.limit, float(ceiling))
+
+
+class _Host:
+    """
+    The requests running to a host and the host's limit.
+
+    @ivar host: The host (and port).
+    @type host: str
+    @ivar active: The number of requests running.
+    @type active: int
+    @ivar limit: The number of requests allowed to run (0=unlimited).
+    @type limit: float
+    @ivar latency: The average request latency (seconds).
+    @type latency: float
+    @ivar lowered: When the limit was last lowered (monotonic seconds).
+    @type lowered: float
+
+    """
+
+    __slots__ = ("host", "active", "limit", "latency", "lowered")
+
+    def __init__(self, host, limit):
+        self.host = host
+        self.active = 0
+        self.limit = limit
+        self.latency = 0.0
+        self.lowered = 0.0
+
+
+class RetryPolicy:
+    """
+    Decides whether and when failed requests are sent again.
+
+    A request is retried when it fails with one of the I{exceptions} or gets
+    a reply with one of the I{statuses}, but only if it is marked
+    I{idempotent}. Others are only retried when the connection could not be
+    established at all, i.e. when the request was surely never sent.
+    Retries wait an exponentially growing delay with full jitter, stop
+    after I{attempts} attempts in total or when the I{deadline} would be
+    exceeded, and are paid for from a token bucket: each retry takes a
+    token and each successful request, i.e. one replied to with a 2xx
+    status or a SOAP fault (500), puts back I{ratio} of one, up to I{budget}
+    tokens. So while a service is down, retries soon stop adding to its load.
+
+    The policy, and so its budget, is shared by the clients and transports
+    using it, including their copies.
+
+    @ivar attempts: The maximum number of attempts per request.
+    @type attempts: int
+    @ivar delay: The delay before the first retry (seconds), doubled for
+        each further one.
+    @type delay: float
+    @ivar max_delay: The maximum delay between attempts (seconds).
+    @type max_delay: float
+    @ivar deadline: The time allowed for all attempts of a request together
+        (seconds, 0=unlimited).
+    @type deadline: float
+    @ivar statuses: The retried HTTP reply status codes.
+    @type statuses: I{collection} of int
+    @ivar exceptions: The retried exception classes.
+    @type exceptions: I{tuple} of I{class}
+    @ivar budget: The maximum number of tokens in the retry budget.
+    @type budget: float
+    @ivar ratio: The tokens put back by each successful request.
+    @type ratio: float
+    @ivar tokens: The tokens in the retry budget.
+    @type tokens: float
+    @ivar retries: The number of retries made.
+    @type retries: int
+    @ivar denied: The number of retries not made for lack of budget.
+    @type denied: int
+
+    """
+
+    def __init__(
+        self,
+        attempts=3,
+        delay=0.1,
+        max_delay=5.0,
+        deadline=0,
+        statuses=(502, 503, 504),
+        exceptions=(aiohttp.ClientConnectionError, asyncio.TimeoutError),
+        budget=10.0,
+        ratio=0.1,
+    ):
+        """
+        @param attempts: The maximum number of attempts per request.
+        @type attempts: int
+        @param delay: The delay before the first retry (seconds).
+        @type delay: float
+        @param max_delay: The maximum delay between attempts (seconds).
+        @type max_delay: float
+        @param deadline: The time allowed for all attempts of a request
+            together (seconds, 0=unlimited).
+        @type deadline: float
+        @param statuses: The retried HTTP reply status codes.
+        @type statuses: I{collection} of int
+        @param exceptions: The retried exception classes.
+        @type exceptions: I{tuple} of I{class}
+        @param budget: The maximum number of tokens in the retry budget.
+        @type budget: float
+        @param ratio: The tokens put back by each successful request.
+        @type ratio: float
+
+        """
+        self.attempts = attempts
+        self.delay = delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.statuses = frozenset(statuses)
+        self.exceptions = tuple(exceptions)
+        self.budget = budget
+        self.ratio = ratio
+        self.tokens = budget
+        self.retries = 0
+        self.denied = 0
+
+    def expiry(self):
+        """
+        Get when a request started now has to be completed.
+
+        @return: The event loop time of the deadline, or None when unlimited.
+        @rtype: float
+
+        """
+        if self.deadline:
+            return asyncio.get_event_loop().time() + self.deadline
+
+    def remaining(self, expiry):
+        """
+        Get the time left until a deadline.
+
+        @param expiry: The deadline returned by L{expiry()}.
+        @type expiry: float
+        @return: The time left (seconds), or None when unlimited.
+        @rtype: float
+
+        """
+        if expiry is not None:
+            return max(0.0, expiry - asyncio.get_event_loop().time())
+
+    def succeeded(self, status):
+        """
+        Account for a completed attempt, putting back part of a token into the
+        budget when it succeeded.
+
+        @param status: The HTTP reply status code.
+        @type status: int
+
+        """
+        if 200 <= status < 300 or status == 500:
+            self.tokens = min(self.budget, self.tokens + self.ratio)
+
+    def backoff(self, attempt, expiry, idempotent, status=None, error=None):
+        """
+        Get whether and after what delay an attempt is to be retried, taking
+        the retry from the budget.
+
+        @param attempt: The number of attempts made so far.
+        @type attempt: int
+        @param expiry: The deadline returned by L{expiry()}.
+        @type expiry: float
+        @param idempotent: The request may safely be sent more than once.
+        @type idempotent: bool
+        @param status: The HTTP reply status code, None when failed.
+        @type status: int
+        @param error: The exception the attempt failed with, None when
+            replied.
+        @type error: Exception
+        @return: The delay before retrying (seconds), None for not retrying.
+        @rtype: float
+
+        """
+        if error is None:
+            if not idempotent or status not in self.statuses:
+                return None
+        elif not isinstance(error, aiohttp.ClientConnectorError):
+            if not idempotent or not isinstance(error, self.exceptions):
+                return None
+        if attempt >= self.attempts:
+            return None
+        delay = random.uniform(0, min(self.max_delay, self.delay * 2 ** (attempt - 1)))
+        remaining = self.remaining(expiry)
+        if remaining is not None and delay >= remaining:
+            return None
+        if self.tokens < 1:
+            self.denied += 1
+            return None
+        self.tokens -= 1
+        self.retries += 1
+        return delay
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class HedgePolicy:
+    """
+    Decides when a second copy of a slow request is sent.
+
+    A copy is sent, optionally to an alternate I{location}, when a request
+    has not been answered within the I{percentile} of the operation's
+    recent latencies, or within I{delay} until I{samples} latencies have
+    been seen. Copies are paid for from a token bucket: each copy takes a
+    token and each request puts back I{ratio} of one, up to I{budget}
+    tokens, so at most about I{ratio} of the requests are sent twice.
+
+    The policy, and so its budget and latencies, is shared by the clients
+    using it, including their copies.
+
+    @ivar percentile: The percentile of recent latencies after which a copy
+        is sent.
+    @type percentile: float
+    @ivar delay: The delay after which a copy is sent while too few
+        latencies are known (seconds).
+    @type delay: float
+    @ivar location: The alternate location the copies are sent to, None for
+        the location of the request.
+    @type location: str
+    @ivar budget: The maximum number of tokens in the hedging budget.
+    @type budget: float
+    @ivar ratio: The tokens put back by each request.
+    @type ratio: float
+    @ivar window: The number of recent latencies kept for each operation.
+    @type window: int
+    @ivar samples: The number of latencies needed for using the percentile.
+    @type samples: int
+    @ivar tokens: The tokens in the hedging budget.
+    @type tokens: float
+    @ivar hedged: The number of copies sent.
+    @type hedged: int
+    @ivar won: The number of copies answered before the original request.
+    @type won: int
+    @ivar denied: The number of copies not sent for lack of budget.
+    @type denied: int
+
+    """
+
+    def __init__(
+        self,
+        percentile=95,
+        delay=1.0,
+        location=None,
+        budget=10.0,
+        ratio=0.05,
+        window=1000,
+        samples=20,
+    ):
+        """
+        @param percentile: The percentile of recent latencies after which a
+            copy is sent.
+        @type percentile: float
+        @param delay: The delay after which a copy is sent while too few
+            latencies are known (seconds).
+        @type delay: float
+        @param location: The alternate location the copies are sent to.
+        @type location: str
+        @param budget: The maximum number of tokens in the hedging budget.
+        @type budget: float
+        @param ratio: The tokens put back by each request.
+        @type ratio: float
+        @param window: The number of recent latencies kept for each
+            operation.
+        @type window: int
+        @param samples: The number of latencies needed for using the
+            percentile.
+        @type samples: int
+
+        """
+        self.percentile = percentile
+        self.delay = delay
+        self.location = location
+        self.budget = budget
+        self.ratio = ratio
+        self.window = window
+        self.samples = samples
+        self.tokens = budget
+        self.hedged = 0
+        self.won = 0
+        self.denied = 0
+        self.__latencies = {}
+        self.__delays = {}
+        self.__recorded = 0
+
+    def start(self, name):
+        """
+        Start a request of an operation, adding to the budget.
+
+        @param name: The operation name.
+        @type name: str
+        @return: The delay after which a copy is to be sent (seconds).
+        @rtype: float
+
+        """
+        self.tokens = min(self.budget, self.tokens + self.ratio)
+        delay = self.__delays.get(name)
+        if delay is None:
+            latencies = self.__latencies.get(name, ())
+            if len(latencies) < self.samples:
+                return self.delay
+            ordered = sorted(latencies)
+            index = int(len(ordered) * self.percentile / 100.0)
+            delay = self.__delays[name] = ordered[min(index, len(ordered) - 1)]
+        return delay
+
+    def spend(self):
+        """
+        Take a copy of a request from the budget.
+
+        @return: True if the copy may be sent.
+        @rtype: bool
+
+        """
+        if self.tokens < 1:
+            self.denied += 1
+            return False
+        self.tokens -= 1
+        self.hedged += 1
+        return True
+
+    def record(self, name, latency, copy=False):
+        """
+        Record the latency of an answered request of an operation.
+
+        @param name: The operation name.
+        @type name: str
+        @param latency: The time the request took, from sending the original
+            when answered by a copy (seconds).
+        @type latency: float
+        @param copy: The request was a copy answered first.
+        @type copy: bool
+
+        """
+        latencies = self.__latencies.get(name)
+        if latencies is None:
+            latencies = self.__latencies[name] = deque(maxlen=self.window)
+        latencies.append(latency)
+        self.__recorded += 1
+        if self.__recorded % 16 == 0:
+            self.__delays.clear()
+        if copy:
+            self.won += 1
+
+    def __deepcopy__(self, memo):
+        return self
+
+
 class HttpTransport(Transport):
     """
     Basic HTTP transport implemented using using urllib2, that provides for
     cookies & proxies but no authentication.
 
+    @ivar pool: The session pool used when the I{pool} option is set. Shared
+        with any transport copied from this one.
+    @type pool: L{SessionPool}
+    @ivar limiter: The request limiter used when any of the I{max_requests}
+        options is set. Shared with any transport copied from this one.
+    @type limiter: L{Limiter}
+
     """
 
     def __init__(self, **kwargs):
@@ -32,54 +669,290 @@ class HttpTransport(Transport):
             - B{timeout} - Set the URL open timeout (seconds).
                     - type: I{float}
                     - default: 90
+            - B{pool} - Reuse pooled keep-alive connections between requests.
+                    - type: I{bool}
+                    - default: False
 
         """
         Transport.__init__(self)
         Unskin(self.options).update(kwargs)
         self.cookiejar = CookieJar()
+        self.pool = None
+        self.limiter = None
 
     async def open(self, request):
-        headers = request.headers
         log.info("sending:\n%s", request)
-        connector = aiohttp.TCPConnector(verify_ssl=request.verify_ssl)
-        client = aiohttp.ClientSession(
-            connector=connector, cookies=dict(self.cookiejar),
-        )
-        try:
-            res = await client.get(request.url, headers=headers, proxy=request.proxy)
-            reply = await res.content.read()
-            res.close()
-            log.info("received:\n%s", reply)
-            return str(reply, encoding="utf-8")
-        finally:
-            await client.close()
-            await connector.close()
+        reply = await self.__request("GET", request)
+        log.info("received:\n%s", reply)
+        return reply
 
     async def send(self, request):
-        msg = request.message
-        headers = request.headers
         log.info("sending:\n%s", request)
+        reply = await self.__request("POST", request, request.message)
+        log.info("received:\n%s", reply)
+        return reply
+
+    async def stream(self, request, feed):
+        log.info("sending:\n%s", request)
+        await self.__request("POST", request, request.message, feed)
+
+    async def close(self):
+        if self.pool is not None:
+            await self.pool.close()
+
+    def sessionpool(self):
+        """
+        Get the session pool, creating it from the transport options.
+
+        @return: The session pool.
+        @rtype: L{SessionPool}
+
+        """
+        if self.pool is None:
+            self.pool = SessionPool(
+                limit=self.options.pool_limit,
+                limit_per_host=self.options.pool_limit_per_host,
+                keepalive_timeout=self.options.keepalive_timeout,
+            )
+        return self.pool
+
+    def requestlimiter(self):
+        """
+        Get the request limiter, creating it from the transport options.
+
+        @return: The request limiter, or None when requests are not limited.
+        @rtype: L{Limiter}
+
+        """
+        if self.limiter is None:
+            options = self.options
+            if not (
+                options.max_requests
+                or options.max_requests_per_host
+                or options.adaptive_requests
+            ):
+                return None
+            self.limiter = Limiter(
+                limit=options.max_requests,
+                limit_per_host=options.max_requests_per_host,
+                adaptive=options.adaptive_requests,
+                tolerance=options.latency_tolerance,
+            )
+        return self.limiter
+
+    async def __request(self, method, request, data=None, feed=None):
+        """
+        Perform an HTTP request and read the reply body, retrying it as
+        allowed by the request's retry policy.
+
+        Replies to SOAP (I{POST}) requests with an HTTP error status other
+        than 500, which carries SOAP faults, and replies with a retried HTTP
+        status are read at once instead of being passed to I{feed}, and
+        reported as a L{TransportError} once no more attempts are made.
+        Requests are not retried after any part of the reply has been passed
+        on.
+
+        @param method: The HTTP method.
+        @type method: str
+        @param request: A transport request.
+        @type request: L{Request}
+        @param data: The optional request body.
+        @type data: bytes
+        @param feed: The optional reply body consumer.
+        @type feed: callable(bytes)
+        @return: The reply body, or None when streamed to I{feed}.
+        @rtype: bytes
+
+        """
+        retry = request.retry
+        if retry is None:
+            status, reply = await self.__limited(method, request, data, feed)
+            if method == "POST" and self.__failed(status):
+                raise self.__error(status, reply)
+            return reply
+        streamed = False
+
+        def consume(chunk):
+            nonlocal streamed
+            streamed = True
+            feed(chunk)
+
+        expiry = retry.expiry()
+        attempt = 1
+        while True:
+            status = reply = error = None
+            try:
+                status, reply = await self.__limited(
+                    method, request, data, feed and consume, expiry
+                )
+            except Exception as e:
+                error = e
+            else:
+                retry.succeeded(status)
+            delay = None
+            if not streamed:
+                delay = retry.backoff(
+                    attempt, expiry, request.idempotent, status, error
+                )
+            if delay is None:
+                if error is not None:
+                    raise error
+                if status in retry.statuses or (
+                    method == "POST" and self.__failed(status)
+                ):
+                    raise self.__error(status, reply)
+                if feed is not None and reply is not None:
+                    feed(reply)
+                return reply
+            log.debug(
+                "attempt %d to (%s) failed (%s), retrying in %.3fs",
+                attempt,
+                request.url,
+                error or status,
+                delay,
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def __limited(self, method, request, data=None, feed=None, expiry=None):
+        """
+        Perform an HTTP request within the request limits and read the reply
+        body.
+
+        Requests timing out, including those not completed by the deadline,
+        are reported to the limiter as overloading the host.
+
+        @param method: The HTTP method.
+        @type method: str
+        @param request: A transport request.
+        @type request: L{Request}
+        @param data: The optional request body.
+        @type data: bytes
+        @param feed: The optional reply body consumer.
+        @type feed: callable(bytes)
+        @param expiry: The optional event loop time of the deadline, see
+            L{RetryPolicy.expiry()}.
+        @type expiry: float
+        @return: The HTTP status and the reply body, or None when streamed to
+            I{feed}.
+        @rtype: (int, bytes)
+
+        """
+        limiter = self.requestlimiter()
+        if limiter is None:
+            exchange = self.__exchange(method, request, data, feed)
+            return await self.__until(exchange, expiry)
+        acquire = limiter.acquire(urlparse(request.url).netloc)
+        state = await self.__until(acquire, expiry)
+        started = time.monotonic()
+        latency = None
+        overloaded = False
+        try:
+            exchange = self.__exchange(method, request, data, feed)
+            status, reply = await self.__until(exchange, expiry)
+            overloaded = status == 503
+            latency = time.monotonic() - started
+            return status, reply
+        except asyncio.TimeoutError:
+            overloaded = True
+            raise
+        finally:
+            limiter.release(state, latency, overloaded)
+
+    @staticmethod
+    async def __until(awaitable, expiry):
+        """
+        Wait for an awaitable to complete before a deadline.
+
+        @param awaitable: The awaitable.
+        @type awaitable: awaitable
+        @param expiry: The event loop time of the deadline, or None when
+            unlimited.
+        @type expiry: float
+        @return: The result of I{awaitable}.
+        @raise asyncio.TimeoutError: The deadline passed.
+
+        """
+        if expiry is None:
+            return await awaitable
+        timeout = max(0.0, expiry - asyncio.get_event_loop().time())
+        return await asyncio.wait_for(awaitable, timeout)
+
+    async def __exchange(self, method, request, data=None, feed=None):
+        """
+        Perform an HTTP request and read the reply body.
+
+        The reply body is either returned at once or, when I{feed} is given,
+        passed to it chunk by chunk as it arrives.
+
+        @param method: The HTTP method.
+        @type method: str
+        @param request: A transport request.
+        @type request: L{Request}
+        @param data: The optional request body.
+        @type data: bytes
+        @param feed: The optional reply body consumer.
+        @type feed: callable(bytes)
+        @return: The HTTP status and the reply body, or None when streamed to
+            I{feed}.
+        @rtype: (int, bytes)
+
+        """
+        if self.options.pool:
+            session = self.sessionpool().session(cookies=dict(self.cookiejar))
+            kwargs = dict(data=data, headers=request.headers, proxy=request.proxy)
+            if not request.verify_ssl:
+                kwargs["ssl"] = False
+            async with session.request(method, request.url, **kwargs) as res:
+                return res.status, await self.__read(res, feed, request.retry)
         connector = aiohttp.TCPConnector(verify_ssl=request.verify_ssl)
         client = aiohttp.ClientSession(
             connector=connector, cookies=dict(self.cookiejar)
         )
         try:
-            res = await client.post(
-                request.url, data=msg, headers=headers, proxy=request.proxy
+            res = await client.request(
+                method,
+                request.url,
+                data=data,
+                headers=request.headers,
+                proxy=request.proxy,
             )
-            reply = await res.content.read()
-            res.close()
-            log.info("received:\n%s", reply)
-            return str(reply, encoding="utf-8")
+            try:
+                return res.status, await self.__read(res, feed, request.retry)
+            finally:
+                res.close()
         finally:
             await client.close()
             await connector.close()
 
-    def __deepcopy__(self):
+    @staticmethod
+    def __failed(status):
+        return not 200 <= status < 300 and status != 500
+
+    @staticmethod
+    def __error(status, reply):
+        reason = http.client.responses.get(status, "HTTP error")
+        return TransportError(reason, status, io.BytesIO(reply or b""))
+
+    @classmethod
+    async def __read(cls, res, feed, retry):
+        if (
+            feed is None
+            or cls.__failed(res.status)
+            or retry is not None
+            and res.status in retry.statuses
+        ):
+            return await res.content.read()
+        async for chunk in res.content.iter_any():
+            feed(chunk)
+
+    def __deepcopy__(self, memo=None):
         clone = self.__class__()
         p = Unskin(self.options)
         cp = Unskin(clone.options)
         cp.update(p)
+        clone.pool = self.sessionpool()
+        clone.limiter = self.requestlimiter()
         return clone
 
 
@@ -99,6 +972,10 @@ class HttpAuthenticated(HttpTransport):
         self.add_credentials(request)
         return await HttpTransport.send(self, request)
 
+    async def stream(self, request, feed):
+        self.add_credentials(request)
+        await HttpTransport.stream(self, request, feed)
+
     def add_credentials(self, request):
         credentials = self.credentials()
         if None not in credentials:
@@ -29,6 +29,42 @@ class Options(Skin):
         - B{password} - The password used for HTTP authentication.
                 - type: I{str}
                 - default: None
+        - B{pool} - Keep a long-lived session with a pool of keep-alive
+            connections instead of opening a new connection per request.
+            Pooled connections are released by the client's close().
+                - type: I{bool}
+                - default: False
+        - B{pool_limit} - The total number of simultaneous pooled connections
+            (0=unlimited).
+                - type: I{int}
+                - default: 100
+        - B{pool_limit_per_host} - The number of simultaneous pooled
+            connections to a single host (0=unlimited).
+                - type: I{int}
+                - default: 0
+        - B{keepalive_timeout} - Idle pooled connections are closed after
+            this many seconds.
+                - type: I{float}
+                - default: 15
+        - B{max_requests} - The total number of requests running at the same
+            time (0=unlimited). Requests over the limit wait in a first-in
+            first-out queue. Limits are shared by all clients using the same
+            transport.
+                - type: I{int}
+                - default: 0
+        - B{max_requests_per_host} - The number of requests running at the
+            same time to a single host (0=unlimited).
+                - type: I{int}
+                - default: 0
+        - B{adaptive_requests} - Adjust the number of requests running to
+            each host, lowering it when the host replies with HTTP 503,
+            times out or slows down and raising it again while it keeps up.
+                - type: I{bool}
+                - default: False
+        - B{latency_tolerance} - The latency, relative to the host's
+            average, above which I{adaptive_requests} lowers the limit.
+                - type: I{float}
+                - default: 2.0
 
     """
 
@@ -40,5 +76,13 @@ class Options(Skin):
             Definition("headers", dict, {}),
             Definition("username", str, None),
             Definition("password", str, None),
+            Definition("pool", bool, False),
+            Definition("pool_limit", int, 100),
+            Definition("pool_limit_per_host", int, 0),
+            Definition("keepalive_timeout", (int, float), 15),
+            Definition("max_requests", int, 0),
+            Definition("max_requests_per_host", int, 0),
+            Definition("adaptive_requests", bool, False),
+            Definition("latency_tolerance", (int, float), 2.0),
         ]
         Skin.__init__(self, domain, definitions, kwargs)
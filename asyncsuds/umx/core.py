@@ -61,10 +61,11 @@ class Core:
         @rtype: I{any}
         """
         node = content.node
-        if len(node.children) and node.hasText():
+        children = self.has_children(content)
+        if children and node.hasText():
             return node
-        attributes = AttrList(node.attributes)
-        if attributes.rlen() and not len(node.children) and node.hasText():
+        attributes = AttrList(node._attributes)
+        if attributes.rlen() and not children and node.hasText():
             p = Factory.property(node.name, node.getText())
             return merge(content.data, p)
         if len(content.data):
@@ -72,7 +73,7 @@ class Core:
         lang = attributes.lang()
         if content.node.isnil():
             return None
-        if not len(node.children) and content.text is None:
+        if not children and content.text is None:
             if self.nillable(content):
                 return None
             else:
@@ -89,7 +90,7 @@ class Core:
         @param content: The current content being unmarshalled.
         @type content: L{Content}
         """
-        attributes = AttrList(content.node.attributes)
+        attributes = AttrList(content.node._attributes)
         for attr in attributes.real():
             name = attr.name
             value = attr.value
@@ -118,21 +119,34 @@ class Core:
         for child in content.node:
             cont = Content(child)
             cval = self.append(cont)
-            key = reserved.get(child.name, child.name)
-            if key in content.data:
-                v = getattr(content.data, key)
-                if isinstance(v, list):
-                    v.append(cval)
-                else:
-                    setattr(content.data, key, [v, cval])
-                continue
-            if self.multi_occurrence(cont):
-                if cval is None:
-                    setattr(content.data, key, [])
-                else:
-                    setattr(content.data, key, [cval])
+            self.append_child(cont, cval, content)
+
+    def append_child(self, cont, cval, content):
+        """
+        Append an unmarshalled child node into L{Content.data}
+        @param cont: The child content.
+        @type cont: L{Content}
+        @param cval: The unmarshalled child value.
+        @type cval: I{any}
+        @param content: The current content being unmarshalled.
+        @type content: L{Content}
+        """
+        name = cont.node.name
+        key = reserved.get(name, name)
+        if key in content.data:
+            v = getattr(content.data, key)
+            if isinstance(v, list):
+                v.append(cval)
+            else:
+                setattr(content.data, key, [v, cval])
+            return
+        if self.multi_occurrence(cont):
+            if cval is None:
+                setattr(content.data, key, [])
             else:
-                setattr(content.data, key, cval)
+                setattr(content.data, key, [cval])
+        else:
+            setattr(content.data, key, cval)
 
     def append_text(self, content):
         """
@@ -164,6 +178,16 @@ class Core:
         @type content: L{Content}
         """
 
+    def has_children(self, content):
+        """
+        Get whether the content node has child nodes.
+        @param content: The current content being unmarshalled.
+        @type content: L{Content}
+        @return: True if the node has children, else False.
+        @rtype: boolean
+        """
+        return len(content.node.children) > 0
+
     def single_occurrence(self, content):
         """
         Get whether the content has at most a single occurrence (not a list).
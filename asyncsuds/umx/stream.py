@@ -0,0 +1,93 @@
+"""
+Provides event driven (streaming) unmarshaller classes.
+"""
+
+from asyncsuds import *
+from asyncsuds.sax.text import Text
+from asyncsuds.umx import *
+from asyncsuds.umx.typed import Typed
+
+#
+# Add streaming extensions
+# chars = The character data received for the node so far.
+# children = Whether the node had any child nodes.
+#
+Content.extensions.append("chars")
+Content.extensions.append("children")
+
+
+class Unsupported(Exception):
+    """Content that can only be unmarshalled from a complete XML tree."""
+
+
+class Stream(Typed):
+    """
+    A I{typed} XML unmarshaller driven by parser events.
+
+    Each node is unmarshalled as soon as it ends, so the XML tree never gets
+    built. The nodes passed in must be linked to their parent node (needed to
+    resolve namespace prefixes) but must not have any children.
+    @ivar stack: The content of the nodes being unmarshalled.
+    @type stack: [L{Content},...]
+    """
+
+    def __init__(self, schema):
+        """
+        @param schema: A schema object.
+        @type schema: L{xsd.schema.Schema}
+        """
+        Typed.__init__(self, schema)
+        self.stack = []
+
+    def push(self, node, type=None):
+        """
+        A node has started.
+        @param node: The started node.
+        @type node: L{sax.element.Element}
+        @param type: The schema type of a new top level node.
+        @type type: L{xsd.sxbase.SchemaObject}
+        """
+        if not self.stack:
+            self.reset()
+        content = Content(node, chars=[], children=False)
+        content.type = type
+        self.start(content)
+        self.append_attributes(content)
+        self.stack.append(content)
+
+    def characters(self, text):
+        """
+        Character data for the current node was received.
+        @param text: The character data.
+        @type text: str
+        """
+        self.stack[-1].chars.append(text)
+
+    def pop(self):
+        """
+        The current node has ended.
+        @return: The unmarshalled node value.
+        @rtype: L{Object}
+        """
+        content = self.stack.pop()
+        node = content.node
+        if content.chars:
+            node.text = Text("".join(content.chars))
+            if content.children:
+                node.trim()
+        self.append_text(content)
+        self.end(content)
+        value = self.postprocess(content)
+        if self.stack:
+            parent = self.stack[-1]
+            parent.children = True
+            self.append_child(content, value, parent)
+        return value
+
+    def postprocess(self, content):
+        if content.children and content.node.hasText():
+            raise Unsupported("<%s/> has mixed content" % (content.node.name,))
+        return Typed.postprocess(self, content)
+
+    def has_children(self, content):
+        return content.children
@@ -6,7 +6,6 @@ WSDL schema document.
 
 """
 
-import asyncio
 import re
 from logging import getLogger
 from urllib.parse import urljoin
@@ -25,6 +24,7 @@ from asyncsuds.xsd import qualify
 from asyncsuds.xsd.query import ElementQuery
 from asyncsuds.xsd.schema import Schema
 from asyncsuds.xsd.schema import SchemaCollection
+from asyncsuds.xsd.schema import SchemaLoader
 
 log = getLogger(__name__)
 
@@ -134,6 +134,7 @@ class Definitions(WObject):
         self.services = []
         self.headers = headers or {}
         self.verify_ssl = True
+        self.proxy = None
 
     def __call__(self):
         """
@@ -144,10 +145,24 @@ class Definitions(WObject):
 
         """
 
-    @asyncio.coroutine
-    def connect(self):
-        self.reader.verify_ssl = self.verify_ssl
-        d = yield from self.reader.open(self.url, headers=self.headers)
+    async def connect(self, loader=None):
+        """
+        Fetch and load the WSDL along with everything it imports.
+
+        @param loader: The loader shared by an importing WSDL, if any.
+        @type loader: L{DefinitionsLoader}
+
+        """
+        if loader is None:
+            loader = DefinitionsLoader(self.options)
+            loader.verify_ssl = self.verify_ssl
+            loader.proxy = self.proxy
+            self.reader.verify_ssl = self.verify_ssl
+            self.reader.proxy = self.proxy
+            d = await self.reader.open(self.url, headers=self.headers)
+        else:
+            d = await loader.open(self.url)
+        loader.definitions[self.url] = None
         self.root = d.root()
         WObject.__init__(self, self.root)
         self.tns = self.mktns(self.root)
@@ -158,9 +173,10 @@ class Definitions(WObject):
         pmd.excludes.append("children")
         pmd.excludes.append("wsdl")
         pmd.wrappers["schema"] = repr
-        yield from self.open_imports()
+        await self.open_imports(loader)
         self.resolve()
-        self.build_schema()
+        await self.build_schema(loader)
+        loader.definitions[self.url] = self
         self.set_wrapped()
         for s in self.services:
             self.add_methods(s)
@@ -201,19 +217,35 @@ class Definitions(WObject):
                 self.services.append(child)
                 continue
 
-    @asyncio.coroutine
-    def open_imports(self):
-        """Import the I{imported} WSDLs."""
+    async def open_imports(self, loader):
+        """
+        Import the I{imported} WSDLs.
+
+        The whole import graph is fetched concurrently first. The imports are
+        then loaded and merged one by one in document order.
+
+        @param loader: The document loader.
+        @type loader: L{DefinitionsLoader}
+
+        """
+        urls = [imp.url(self) for imp in self.imports]
+        await loader.prefetch([url for url in urls if url not in loader.definitions])
         for imp in self.imports:
-            yield from imp.load(self)
+            await imp.load(self, loader)
 
     def resolve(self):
         """Tell all children to resolve themselves."""
         for c in self.children:
             c.resolve(self)
 
-    def build_schema(self):
-        """Process L{Types} objects and create the schema collection."""
+    async def build_schema(self, loader):
+        """
+        Process L{Types} objects and create the schema collection.
+
+        @param loader: The document loader.
+        @type loader: L{SchemaLoader}
+
+        """
         container = SchemaCollection(self)
         for t in [t for t in self.types if t.local()]:
             for root in t.contents():
@@ -223,7 +255,7 @@ class Definitions(WObject):
             root = Element.buildPath(self.root, "types/schema")
             schema = Schema(root, self.url, self.options, container)
             container.add(schema)
-        self.schema = container.load(self.options)
+        self.schema = await container.load(self.options, loader)
         for s in [t.schema() for t in self.types if t.imported()]:
             self.schema.merge(s)
         return self.schema
@@ -276,7 +308,7 @@ class Definitions(WObject):
                         body.wrapped = True
 
     def __getstate__(self):
-        nopickle = ("options",)
+        nopickle = ("options", "reader")
         state = self.__dict__.copy()
         for k in nopickle:
             if k in state:
@@ -315,16 +347,46 @@ class Import(WObject):
         pmd = self.__metadata__.__print__
         pmd.wrappers["imported"] = repr
 
-    @asyncio.coroutine
-    def load(self, definitions):
-        """Load the object by opening the URL."""
+    def url(self, definitions):
+        """
+        Get the absolute URL of the imported document.
+
+        @param definitions: The importing definitions object.
+        @type definitions: L{Definitions}
+        @return: The document URL.
+        @rtype: str
+
+        """
         url = self.location
-        log.debug("importing (%s)", url)
         if "://" not in url:
             url = urljoin(definitions.url, url)
-        options = definitions.options
-        d = Definitions(url, options)
-        yield from d.connect()
+        return url
+
+    async def load(self, definitions, loader):
+        """
+        Load the object by opening the URL.
+
+        A document already imported elsewhere in the import graph is reused
+        and a document still being loaded (an import cycle) is skipped.
+
+        @param definitions: The importing definitions object.
+        @type definitions: L{Definitions}
+        @param loader: The document loader.
+        @type loader: L{DefinitionsLoader}
+
+        """
+        url = self.url(definitions)
+        log.debug("importing (%s)", url)
+        if url in loader.definitions:
+            d = loader.definitions[url]
+            if d is None:
+                log.debug("import of (%s) is cyclic, skipped", url)
+                return
+        else:
+            d = Definitions(url, definitions.options)
+            d.verify_ssl = definitions.verify_ssl
+            d.proxy = definitions.proxy
+            await d.connect(loader)
         if d.root.match(Definitions.Tag, wsdlns):
             self.import_definitions(definitions, d)
             return
@@ -351,13 +413,51 @@ class Import(WObject):
             definitions.types.append(types)
         else:
             types = definitions.types[-1]
-        types.root.append(d.root)
+        root = d.root
+        if root.parent is not None:
+            root = root.clone()
+        types.root.append(root)
         log.debug("imported (XSD):\n%s", d.root)
 
     def __gt__(self, other):
         return False
 
 
+class DefinitionsLoader(SchemaLoader):
+    """
+    Fetches the documents of a WSDL and everything it imports.
+
+    @ivar definitions: Definitions loaded by URL. Definitions still being
+        loaded are mapped to None.
+    @type definitions: {str: L{Definitions}}
+
+    """
+
+    def __init__(self, options):
+        """
+        @param options: An options object.
+        @type options: I{Options}
+
+        """
+        super(DefinitionsLoader, self).__init__(options)
+        self.definitions = {}
+
+    def references(self, url, document):
+        root = document.root()
+        if root is None or not root.match(Definitions.Tag, wsdlns):
+            return super(DefinitionsLoader, self).references(url, document)
+        result = []
+        for imp in root.getChildren("import", wsdlns):
+            location = imp.get("location")
+            if location is None:
+                continue
+            if "://" not in location:
+                location = urljoin(url, location)
+            if location not in self.definitions:
+                result.append(location)
+        return result
+
+
 class Types(WObject):
     """Represents <types><schema/></types>."""
 
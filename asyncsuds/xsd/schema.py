@@ -10,12 +10,14 @@ and targeted denormalization.
 from logging import getLogger
 
 from asyncsuds import *
+from asyncsuds.reader import DocumentLoader
 from asyncsuds.sax import Namespace
 from asyncsuds.sax import splitPrefix
 from asyncsuds.sax.element import Element
 from asyncsuds.xsd import *
 from asyncsuds.xsd.depsort import dependency_sort
 from asyncsuds.xsd.sxbasic import Factory as BasicFactory
+from asyncsuds.xsd.sxbasic import references
 from asyncsuds.xsd.sxbuiltin import *
 
 log = getLogger(__name__)
@@ -62,16 +64,20 @@ class SchemaCollection(object):
             self.namespaces[key] = schema
         else:
             existing.root.children += schema.root.children
-            existing.root.nsprefixes.update(schema.root.nsprefixes)
+            for p, u in schema.root.nsprefixes.items():
+                existing.root.addPrefix(p, u)
 
-    def load(self, options):
+    async def load(self, options, loader):
         """
         Load schema objects for the root nodes.
+            - fetch the referenced schema documents
             - de-reference schemas
             - merge schemas
 
         @param options: An options dictionary.
         @type options: L{options.Options}
+        @param loader: The loader used to fetch referenced documents.
+        @type loader: L{SchemaLoader}
         @return: The merged schema.
         @rtype: L{Schema}
 
@@ -80,8 +86,12 @@ class SchemaCollection(object):
             self.autoblend()
         for child in self.children:
             child.build()
+        urls = []
         for child in self.children:
-            child.open_imports(options)
+            urls += [imp.url() for imp in child.imports]
+        await loader.prefetch([url for url in urls if url is not None])
+        for child in self.children:
+            await child.open_imports(options, loader)
         for child in self.children:
             child.dereference()
         log.debug("loaded:\n%s", self)
@@ -149,6 +159,34 @@ class SchemaCollection(object):
         return "\n".join(result)
 
 
+class SchemaLoader(DocumentLoader):
+    """
+    Fetches the documents referenced by schema imports and includes.
+
+    The import/include graph is discovered up front so that independent
+    documents get fetched concurrently.
+
+    @ivar schemata: Schemas imported during this load by URL.
+    @type schemata: {str: L{Schema}}
+
+    """
+
+    def __init__(self, options):
+        """
+        @param options: An options object.
+        @type options: I{Options}
+
+        """
+        super(SchemaLoader, self).__init__(options)
+        self.schemata = {}
+
+    def references(self, url, document):
+        root = document.root()
+        if root is None or not root.match(Schema.Tag, Namespace.xsdns):
+            return []
+        return references(root, url)
+
+
 class Schema(object):
     """
     The schema is an objectification of a <schema/> (XSD) definition. It
@@ -214,10 +252,7 @@ class Schema(object):
         self.form_qualified = form == "qualified"
         if container is None:
             self.build()
-            self.open_imports(options)
             log.debug("built:\n%s", self)
-            self.dereference()
-            log.debug("dereferenced:\n%s", self)
 
     def mktns(self):
         """
@@ -291,7 +326,22 @@ class Schema(object):
         schema.merged = True
         return self
 
-    def open_imports(self, options):
+    async def load(self, options, loader):
+        """
+        Import the referenced schemas and dereference this (stand-alone)
+        schema.
+
+        @param options: An options dictionary.
+        @type options: L{options.Options}
+        @param loader: The loader used to fetch referenced documents.
+        @type loader: L{SchemaLoader}
+
+        """
+        await self.open_imports(options, loader)
+        self.dereference()
+        log.debug("dereferenced:\n%s", self)
+
+    async def open_imports(self, options, loader):
         """
         Instruct all contained L{sxbasic.Import} children to import all of
         their referenced schemas. The imported schema contents are I{merged}
@@ -299,13 +349,15 @@ class Schema(object):
 
         @param options: An options dictionary.
         @type options: L{options.Options}
+        @param loader: The loader used to fetch referenced documents.
+        @type loader: L{SchemaLoader}
 
         """
         for imp in self.imports:
-            imported = imp.open(options)
+            imported = await imp.open(options, loader)
             if imported is None:
                 continue
-            imported.open_imports(options)
+            await imported.open_imports(options, loader)
             log.debug("imported:\n%s", imported)
             self.merge(imported)
 
@@ -390,7 +442,8 @@ class Schema(object):
         @type baseurl: str
         @param options: An options dictionary.
         @type options: L{options.Options}
-        @return: The newly created schema object.
+        @return: The newly created schema object. Its imports are not yet
+            opened, see L{load()}.
         @rtype: L{Schema}
         @note: This is only used by Import children.
 
@@ -30,6 +30,8 @@ class SchemaObject(object):
 
     """
 
+    __lookup = None
+
     @classmethod
     def prepend(cls, d, s, filter=Filter()):
         """
@@ -134,25 +136,63 @@ class SchemaObject(object):
         @rtype: (L{SchemaObject}, [L{SchemaObject},..])
 
         """
-        for child, ancestry in self.attributes():
-            if child.name == name:
-                return child, ancestry
-        return None, []
+        found = self.lookup()[2].get(name)
+        if found is None:
+            return None, []
+        return found
 
     def get_child(self, name):
         """
         Get (find) a I{non-attribute} child by name.
 
+        An I{any} child matches all names not matched by a child before it.
+
         @param name: A child name.
         @type name: str
         @return: A tuple: the requested (child, ancestry).
         @rtype: (L{SchemaObject}, [L{SchemaObject},..])
 
         """
-        for child, ancestry in self.children():
-            if child.any() or child.name == name:
-                return child, ancestry
-        return None, []
+        children, anychild, attributes = self.lookup()
+        found = children.get(name, anychild)
+        if found is None:
+            return None, []
+        return found
+
+    def lookup(self):
+        """
+        Get the tables used to find children and attributes by name.
+
+        The tables are built from the flattened content on first use, which
+        is expected once the schema has been dereferenced, and are kept for
+        later lookups. Children named after the first I{any} child are left
+        out since the I{any} child matches first.
+
+        @return: A tuple: the (child, ancestry) by name for the children, the
+            first I{any} (child, ancestry) or None and the (attribute,
+            ancestry) by name for the attributes.
+        @rtype: ({str: (L{SchemaObject}, [L{SchemaObject},..])},
+            (L{SchemaObject}, [L{SchemaObject},..]),
+            {str: (L{SchemaObject}, [L{SchemaObject},..])})
+
+        """
+        lookup = self.__lookup
+        if lookup is None:
+            children = {}
+            anychild = None
+            attributes = {}
+            for child, ancestry in self:
+                if child.isattr():
+                    attributes.setdefault(child.name, (child, ancestry))
+                elif anychild is not None:
+                    continue
+                elif child.any():
+                    anychild = (child, ancestry)
+                else:
+                    children.setdefault(child.name, (child, ancestry))
+            lookup = (children, anychild, attributes)
+            self.__lookup = lookup
+        return lookup
 
     def namespace(self, prefix=None):
         """
@@ -4,7 +4,6 @@ from logging import getLogger
 from urllib.parse import urljoin
 
 from asyncsuds import *
-from asyncsuds.reader import DocumentReader
 from asyncsuds.sax import Namespace
 from asyncsuds.transport import TransportError
 from asyncsuds.xsd import *
@@ -547,12 +546,14 @@ class Import(SchemaObject):
             self.location = self.locations.get(self.ns[1])
         self.opened = False
 
-    def open(self, options):
+    async def open(self, options, loader):
         """
         Open and import the referenced schema.
 
         @param options: An options dictionary.
         @type options: L{options.Options}
+        @param loader: The loader used to fetch referenced documents.
+        @type loader: L{schema.SchemaLoader}
         @return: The referenced schema.
         @rtype: L{Schema}
 
@@ -568,7 +569,7 @@ class Import(SchemaObject):
             if self.location is None:
                 log.debug("imported schema (%s) not-found", self.ns[1])
             else:
-                result = self.download(options)
+                result = await self.download(options, loader)
         log.debug("imported:\n%s", result)
         return result
 
@@ -577,17 +578,41 @@ class Import(SchemaObject):
         if self.ns[1] != self.schema.tns[1]:
             return self.schema.locate(self.ns)
 
-    def download(self, options):
-        """Download the schema."""
+    def url(self):
+        """
+        Get the URL the referenced schema is downloaded from.
+
+        @return: The absolute URL or None when the schema is found locally
+            or has no known location.
+        @rtype: str
+
+        """
+        if self.location is None or self.locate() is not None:
+            return
+        return urljoin(self.schema.baseurl, self.location)
+
+    async def download(self, options, loader):
+        """
+        Download the schema.
+
+        A schema already imported from the same URL during this load is
+        reused, which also breaks cyclic imports.
+
+        """
         url = self.location
         try:
             if "://" not in url:
                 url = urljoin(self.schema.baseurl, url)
-            reader = DocumentReader(options)
-            d = reader.open(url)
+            result = loader.schemata.get(url)
+            if result is not None:
+                return result
+            d = await loader.open(url)
             root = d.root()
             root.set("url", url)
-            return self.schema.instance(root, url, options)
+            result = self.schema.instance(root, url, options)
+            loader.schemata[url] = result
+            await result.load(options, loader)
+            return result
         except TransportError:
             msg = "imported schema (%s) at (%s), failed" % (self.ns[1], url)
             log.error("%s, %s", self.id, msg, exc_info=True)
@@ -617,12 +642,14 @@ class Include(SchemaObject):
             self.location = self.locations.get(self.ns[1])
         self.opened = False
 
-    def open(self, options):
+    async def open(self, options, loader):
         """
         Open and include the referenced schema.
 
         @param options: An options dictionary.
         @type options: L{options.Options}
+        @param loader: The loader used to fetch referenced documents.
+        @type loader: L{schema.SchemaLoader}
         @return: The referenced schema.
         @rtype: L{Schema}
 
@@ -631,22 +658,41 @@ class Include(SchemaObject):
             return
         self.opened = True
         log.debug("%s, including location='%s'", self.id, self.location)
-        result = self.download(options)
+        result = await self.download(options, loader)
         log.debug("included:\n%s", result)
         return result
 
-    def download(self, options):
-        """Download the schema."""
+    def url(self):
+        """
+        Get the URL the included schema is downloaded from.
+
+        @return: The absolute URL or None when there is no known location.
+        @rtype: str
+
+        """
+        if self.location is None:
+            return
+        return urljoin(self.schema.baseurl, self.location)
+
+    async def download(self, options, loader):
+        """
+        Download the schema.
+
+        The fetched document may be shared with other imports and includes
+        so the included schema is built from a copy of it.
+
+        """
         url = self.location
         try:
             if "://" not in url:
                 url = urljoin(self.schema.baseurl, url)
-            reader = DocumentReader(options)
-            d = reader.open(url)
-            root = d.root()
+            d = await loader.open(url)
+            root = d.root().clone()
             root.set("url", url)
             self.__applytns(root)
-            return self.schema.instance(root, url, options)
+            result = self.schema.instance(root, url, options)
+            await result.load(options, loader)
+            return result
         except TransportError:
             msg = "include schema at (%s), failed" % url
             log.error("%s, %s", self.id, msg, exc_info=True)
@@ -841,6 +887,34 @@ class Factory:
         return children, imports, attributes, elements, types, groups, agrps
 
 
+def references(root, baseurl):
+    """
+    Get the URLs of the schemas imported or included by a raw schema.
+
+    Used to discover the documents to fetch before the schema object model
+    gets built.
+
+    @param root: A schema XML root.
+    @type root: L{sax.element.Element}
+    @param baseurl: The URL the schema was loaded from.
+    @type baseurl: str
+    @return: The absolute URLs of the referenced schemas.
+    @rtype: [str,...]
+
+    """
+    urls = []
+    for node in root.getChildren(ns=Namespace.xsdns):
+        location = node.get("schemaLocation")
+        if node.name == "import":
+            if location is None:
+                location = Import.locations.get(node.get("namespace"))
+        elif node.name != "include":
+            continue
+        if location is not None:
+            urls.append(urljoin(baseurl, location))
+    return urls
+
+
 #######################################################
 # Static Import Bindings :-(
 #######################################################
@@ -0,0 +1,79 @@
+"""
+Measure XML special character encoding and decoding on typical payloads.
+
+Usage: python benchmarks/escape.py [repeat]
+
+"""
+
+import base64
+import random
+import sys
+import timeit
+
+from asyncsuds.sax import encoder
+
+WORDS = (
+    "order",
+    "customer",
+    "a<b",
+    "R&D",
+    "total",
+    '"quoted"',
+    "it's",
+    "x>y",
+    "delivery",
+    "address",
+    "&amp;",
+    "value",
+)
+
+
+def text(size, seed=0):
+    """Build free text of about I{size} characters with special characters."""
+    rnd = random.Random(seed)
+    words = []
+    length = 0
+    while length < size:
+        word = rnd.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:size]
+
+
+def blob(size, seed=0):
+    """Build a base64 encoded blob of I{size} characters."""
+    rnd = random.Random(seed)
+    data = bytes(rnd.getrandbits(8) for _ in range(size * 3 // 4))
+    return base64.b64encode(data).decode("ascii")
+
+
+def payloads():
+    return (
+        ("short plain", "customer-0042"),
+        ("short text", 'a < b & "c"'),
+        ("text 4KB", text(4096)),
+        ("text 1MB", text(2 ** 20)),
+        ("base64 1MB", blob(2 ** 20)),
+    )
+
+
+def measure(function, value, repeat):
+    number = max(1, 2 ** 20 // max(len(value), 1))
+    timer = timeit.Timer(lambda: function(value))
+    return min(timer.repeat(repeat, number)) / number
+
+
+def main(repeat=5):
+    print("%-12s %12s %12s" % ("payload", "encode", "decode"))
+    for name, value in payloads():
+        encoded = encoder.encode(value)
+        assert encoder.decode(encoded) == value.replace("&amp;", "&")
+        times = [
+            measure(encoder.encode, value, repeat),
+            measure(encoder.decode, encoded, repeat),
+        ]
+        print("%-12s %10.2fus %10.2fus" % ((name,) + tuple(t * 1e6 for t in times)))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,107 @@
+"""
+Measure building and serializing the request envelope for an operation
+taking a wide document/literal request type.
+
+Usage: python benchmarks/marshal.py [fields] [calls]
+
+"""
+
+import asyncio
+import sys
+import time
+
+from asyncsuds.client import Client
+from asyncsuds.sax.writer import Writer
+from asyncsuds.store import DocumentStore
+
+TYPES = ("xs:string", "xs:int", "xs:boolean", "xs:decimal", "xs:dateTime")
+
+WSDL = """<?xml version="1.0" encoding="UTF-8"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+  xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+  xmlns:xs="http://www.w3.org/2001/XMLSchema" xmlns:tns="urn:bench"
+  targetNamespace="urn:bench">
+  <types>
+    <xs:schema targetNamespace="urn:bench" elementFormDefault="qualified">
+      <xs:complexType name="Record"><xs:sequence>%(fields)s
+      </xs:sequence></xs:complexType>
+      <xs:element name="Put"><xs:complexType><xs:sequence>
+        <xs:element name="record" type="tns:Record"/>
+        <xs:element name="comment" type="xs:string" minOccurs="0"/>
+      </xs:sequence></xs:complexType></xs:element>
+      <xs:element name="PutResponse"><xs:complexType><xs:sequence>
+        <xs:element name="id" type="xs:int"/>
+      </xs:sequence></xs:complexType></xs:element>
+    </xs:schema>
+  </types>
+  <message name="PutIn"><part name="parameters" element="tns:Put"/></message>
+  <message name="PutOut">
+    <part name="parameters" element="tns:PutResponse"/>
+  </message>
+  <portType name="BenchPort">
+    <operation name="Put">
+      <input message="tns:PutIn"/><output message="tns:PutOut"/>
+    </operation>
+  </portType>
+  <binding name="BenchBinding" type="tns:BenchPort">
+    <soap:binding style="document"
+      transport="http://schemas.xmlsoap.org/soap/http"/>
+    <operation name="Put">
+      <soap:operation soapAction="urn:bench#Put"/>
+      <input><soap:body use="literal"/></input>
+      <output><soap:body use="literal"/></output>
+    </operation>
+  </binding>
+  <service name="BenchService">
+    <port name="BenchPort" binding="tns:BenchBinding">
+      <soap:address location="http://localhost/bench"/>
+    </port>
+  </service>
+</definitions>
+"""
+
+FIELD = '\n        <xs:element name="f%d" type="%s" minOccurs="0"/>'
+
+
+def wsdl(fields):
+    """Build a WSDL with a I{Record} type having I{fields} fields."""
+    text = "".join(FIELD % (i, TYPES[i % len(TYPES)]) for i in range(fields))
+    return (WSDL % dict(fields=text)).encode("utf-8")
+
+
+async def main(fields=80, calls=2000):
+    store = DocumentStore({"bench.wsdl": wsdl(fields)})
+    client = Client("suds://bench.wsdl", documentStore=store, nosend=True)
+    await client.connect()
+    record = client.factory.create("Record")
+    for i in range(0, fields, 2):
+        setattr(record, "f%d" % (i,), {0: "text", 1: i, 2: True, 3: 1.5}.get(i % 5))
+    method = client.wsdl.services[0].ports[0].methods["Put"]
+    binding = method.binding.input
+    binding.get_message(method, (record,), {})
+    start = time.perf_counter()
+    for _ in range(calls):
+        binding.get_message(method, (record,), {})
+    elapsed = time.perf_counter() - start
+    print(
+        "%d fields, %d calls: %.3fs, %.1fus per envelope"
+        % (fields, calls, elapsed, elapsed / calls * 1e6)
+    )
+    envelope = binding.get_message(method, (record,), {})
+    assert Writer().write(envelope).getvalue() == envelope.plain().encode("utf-8")
+    for name, serialize in (
+        ("plain", lambda: envelope.plain().encode("utf-8")),
+        ("writer", lambda: Writer().write(envelope).getvalue()),
+    ):
+        start = time.perf_counter()
+        for _ in range(calls):
+            serialize()
+        elapsed = time.perf_counter() - start
+        print("%-6s %.1fus per envelope" % (name, elapsed / calls * 1e6))
+    await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.get_event_loop().run_until_complete(
+        main(*[int(arg) for arg in sys.argv[1:]])
+    )
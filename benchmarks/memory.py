@@ -0,0 +1,55 @@
+"""
+Measure the memory held by the document parsed from a large SOAP reply.
+
+Usage: python benchmarks/memory.py [elements]
+
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from parser import reply
+
+from asyncsuds.sax.parser import Parser
+from asyncsuds.sax.parser import etree
+
+
+def count(node):
+    """Count the elements in the tree rooted at I{node}."""
+    total = 0
+    nodes = [node]
+    while nodes:
+        node = nodes.pop()
+        total += 1
+        nodes.extend(node.children)
+    return total
+
+
+def measure(backend, data):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    document = Parser(backend).parse(string=data)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return size, count(document.root())
+
+
+def main(elements=100000):
+    data = reply(elements // 4)
+    print("%.1f MB reply" % (len(data) / 2.0 ** 20,))
+    backends = ["sax", "expat"]
+    if etree is not None:
+        backends.append("lxml")
+    for backend in backends:
+        size, nodes = measure(backend, data)
+        print(
+            "%-6s %d elements, %.1f MB, %d bytes per element"
+            % (backend, nodes, size / 2.0 ** 20, size // nodes)
+        )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
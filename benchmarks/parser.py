@@ -0,0 +1,50 @@
+"""
+Compare the XML parser backends on a large SOAP reply.
+
+Usage: python benchmarks/parser.py [items] [repeat]
+
+"""
+
+import sys
+import timeit
+
+from asyncsuds.sax.parser import Parser
+from asyncsuds.sax.parser import etree
+
+ITEM = (
+    "<ns1:item><ns1:id>%d</ns1:id><ns1:name>item &amp; %d</ns1:name>"
+    '<ns1:price xsi:type="xsd:decimal">%d.5</ns1:price></ns1:item>'
+)
+
+
+def reply(items):
+    """Build a document/literal reply returning I{items} items."""
+    body = "".join(ITEM % (i, i, i) for i in range(items))
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+        'xmlns:xsd="http://www.w3.org/2001/XMLSchema">'
+        '<soap:Body><ns1:GetItemsResponse xmlns:ns1="urn:demo">%s'
+        "</ns1:GetItemsResponse></soap:Body></soap:Envelope>" % body
+    ).encode("utf-8")
+
+
+def main(items=20000, repeat=5):
+    data = reply(items)
+    print("%d items, %.1f MB, best of %d" % (items, len(data) / 2.0 ** 20, repeat))
+    backends = ["sax", "expat"]
+    if etree is not None:
+        backends.append("lxml")
+    baseline = None
+    for backend in backends:
+        parser = Parser(backend)
+        timer = timeit.Timer(lambda: parser.parse(string=data))
+        best = min(timer.repeat(repeat, 1))
+        if baseline is None:
+            baseline = best
+        print("%-6s %8.3fs  x%.2f" % (backend, best, baseline / best))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
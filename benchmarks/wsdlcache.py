@@ -0,0 +1,131 @@
+"""
+Measure the WSDL object cache entry and the warm connect time for a large
+generated WSDL.
+
+Usage: python benchmarks/wsdlcache.py [operations] [repeat]
+
+"""
+
+import asyncio
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+
+from asyncsuds.cache import ObjectCache
+from asyncsuds.client import Client
+from asyncsuds.store import DocumentStore
+
+TYPES = ("xs:string", "xs:int", "xs:boolean", "xs:decimal", "xs:dateTime")
+
+WSDL = """<?xml version="1.0" encoding="UTF-8"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+  xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+  xmlns:xs="http://www.w3.org/2001/XMLSchema" xmlns:tns="urn:bench"
+  targetNamespace="urn:bench">
+  <types>
+    <xs:schema targetNamespace="urn:bench" elementFormDefault="qualified">
+      %(types)s
+    </xs:schema>
+  </types>
+  %(messages)s
+  <portType name="BenchPort">%(operations)s</portType>
+  <binding name="BenchBinding" type="tns:BenchPort">
+    <soap:binding style="document"
+      transport="http://schemas.xmlsoap.org/soap/http"/>
+    %(bindings)s
+  </binding>
+  <service name="BenchService">
+    <port name="BenchPort" binding="tns:BenchBinding">
+      <soap:address location="http://localhost/bench"/>
+    </port>
+  </service>
+</definitions>
+"""
+
+TYPE = """
+      <xs:complexType name="Record%(i)d"><xs:sequence>%(fields)s
+      </xs:sequence></xs:complexType>
+      <xs:element name="Op%(i)d"><xs:complexType><xs:sequence>
+        <xs:element name="record" type="tns:Record%(i)d"/>
+      </xs:sequence></xs:complexType></xs:element>
+      <xs:element name="Op%(i)dResponse"><xs:complexType><xs:sequence>
+        <xs:element name="record" type="tns:Record%(i)d" maxOccurs="unbounded"/>
+      </xs:sequence></xs:complexType></xs:element>"""
+
+FIELD = '\n        <xs:element name="f%d" type="%s" minOccurs="0"/>'
+
+MESSAGES = """
+  <message name="Op%(i)dIn"><part name="parameters" element="tns:Op%(i)d"/></message>
+  <message name="Op%(i)dOut">
+    <part name="parameters" element="tns:Op%(i)dResponse"/>
+  </message>"""
+
+OPERATION = """
+    <operation name="Op%(i)d">
+      <input message="tns:Op%(i)dIn"/><output message="tns:Op%(i)dOut"/>
+    </operation>"""
+
+BINDING = """
+    <operation name="Op%(i)d">
+      <soap:operation soapAction="urn:bench#Op%(i)d"/>
+      <input><soap:body use="literal"/></input>
+      <output><soap:body use="literal"/></output>
+    </operation>"""
+
+
+def wsdl(operations, fields=12):
+    """Build a WSDL with I{operations} operations on their own types."""
+    text = "".join(FIELD % (i, TYPES[i % len(TYPES)]) for i in range(fields))
+    parts = dict(types=TYPE, messages=MESSAGES, operations=OPERATION, bindings=BINDING)
+    for name, part in parts.items():
+        parts[name] = "".join(part % dict(i=i, fields=text) for i in range(operations))
+    return (WSDL % parts).encode("utf-8")
+
+
+async def connect(store, location):
+    client = Client(
+        "suds://bench.wsdl",
+        documentStore=store,
+        cache=ObjectCache(location),
+        cachingpolicy=1,
+    )
+    start = time.perf_counter()
+    await client.connect()
+    return client, time.perf_counter() - start
+
+
+async def main(operations=300, repeat=5):
+    store = DocumentStore({"bench.wsdl": wsdl(operations)})
+    location = tempfile.mkdtemp("-wsdlcache")
+    try:
+        client, elapsed = await connect(store, location)
+        print("%d operations, cold connect: %.1fms" % (operations, elapsed * 1000))
+        (entry,) = [name for name in os.listdir(location) if name.endswith(".px")]
+        with open(os.path.join(location, entry), "rb") as f:
+            data = f.read()
+        plain = pickle.dumps(client.wsdl, 2)
+        for name, size, load in (
+            ("pickle", len(plain), lambda: pickle.loads(plain)),
+            ("entry", len(data), lambda: ObjectCache.loads(data)),
+        ):
+            best = min(timeit(load) for _ in range(repeat))
+            print("%-6s %.1f KB, load: %.1fms" % (name, size / 1024.0, best * 1000))
+        best = min([(await connect(store, location))[1] for _ in range(repeat)])
+        print("warm connect: %.1fms" % (best * 1000,))
+    finally:
+        shutil.rmtree(location, ignore_errors=True)
+
+
+def timeit(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    asyncio.get_event_loop().run_until_complete(
+        main(*[int(arg) for arg in sys.argv[1:]])
+    )
@@ -0,0 +1,168 @@
+"""
+Client tests, run against a local aiohttp server.
+
+"""
+
+import asyncio
+import unittest
+
+from aiohttp import web
+
+from asyncsuds.cache import NoCache
+from asyncsuds.client import Client
+from asyncsuds.transport.http_transport import HedgePolicy
+
+WSDL = """<?xml version="1.0" encoding="UTF-8"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+  xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+  xmlns:xs="http://www.w3.org/2001/XMLSchema" xmlns:tns="urn:test"
+  targetNamespace="urn:test" name="Test">
+  <types>
+    <xs:schema targetNamespace="urn:test" elementFormDefault="qualified">
+      <xs:element name="Echo">
+        <xs:complexType><xs:sequence>
+          <xs:element name="text" type="xs:string"/>
+        </xs:sequence></xs:complexType>
+      </xs:element>
+      <xs:element name="EchoResponse">
+        <xs:complexType><xs:sequence>
+          <xs:element name="text" type="xs:string"/>
+        </xs:sequence></xs:complexType>
+      </xs:element>
+    </xs:schema>
+  </types>
+  <message name="EchoIn"><part name="parameters" element="tns:Echo"/></message>
+  <message name="EchoOut">
+    <part name="parameters" element="tns:EchoResponse"/>
+  </message>
+  <portType name="TestPort">
+    <operation name="Echo">
+      <input message="tns:EchoIn"/><output message="tns:EchoOut"/>
+    </operation>
+  </portType>
+  <binding name="TestBinding" type="tns:TestPort">
+    <soap:binding style="document"
+      transport="http://schemas.xmlsoap.org/soap/http"/>
+    <operation name="Echo">
+      <soap:operation soapAction="urn:test#Echo"/>
+      <input><soap:body use="literal"/></input>
+      <output><soap:body use="literal"/></output>
+    </operation>
+  </binding>
+  <service name="TestService">
+    <port name="TestPort" binding="tns:TestBinding">
+      <soap:address location="http://localhost/soap"/>
+    </port>
+  </service>
+</definitions>
+"""
+
+REPLY = """<?xml version="1.0" encoding="UTF-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+  <soap:Body>
+    <EchoResponse xmlns="urn:test"><text>%s</text></EchoResponse>
+  </soap:Body>
+</soap:Envelope>
+"""
+
+
+class HedgeTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.calls = {}
+        self.disconnected = []
+
+        async def wsdl(request):
+            return web.Response(text=WSDL, content_type="text/xml")
+
+        def soap(name, delay, status=200):
+            async def handler(request):
+                self.calls[name] = self.calls.get(name, 0) + 1
+                await request.read()
+                await asyncio.sleep(delay)
+                if request.transport is None or request.transport.is_closing():
+                    self.disconnected.append(name)
+                if status != 200:
+                    return web.Response(status=status, text="busy")
+                return web.Response(text=REPLY % (name,), content_type="text/xml")
+
+            return handler
+
+        app = web.Application()
+        app.router.add_get("/wsdl", wsdl)
+        app.router.add_post("/slow", soap("slow", 0.5))
+        app.router.add_post("/fast", soap("fast", 0))
+        app.router.add_post("/busy", soap("busy", 0, 503))
+        app.router.add_post("/slowbusy", soap("slowbusy", 0.5, 503))
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base = "http://127.0.0.1:%d/" % (port,)
+        self.clients = []
+
+    async def asyncTearDown(self):
+        for client in self.clients:
+            await client.close()
+        await self.runner.cleanup()
+
+    async def client(self, location, alternate, **kwargs):
+        hedge = HedgePolicy(delay=0.05, location=self.base + alternate, **kwargs)
+        client = Client(
+            self.base + "wsdl",
+            cache=NoCache(),
+            location=self.base + location,
+            hedge=hedge,
+            hedged=True,
+        )
+        self.clients.append(client)
+        await client.connect()
+        return client, hedge
+
+    async def test_not_hedged_when_answered_in_time(self):
+        client, hedge = await self.client("fast", "fast")
+        self.assertEqual(await client.service.Echo("a"), "fast")
+        self.assertEqual(self.calls, {"fast": 1})
+        self.assertEqual(hedge.hedged, 0)
+
+    async def test_copy_wins(self):
+        client, hedge = await self.client("slow", "fast")
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        self.assertEqual(await client.service.Echo("a"), "fast")
+        self.assertLess(loop.time() - started, 0.4)
+        self.assertEqual((hedge.hedged, hedge.won), (1, 1))
+        await asyncio.sleep(0.5)
+        self.assertEqual(self.disconnected, ["slow"])
+
+    async def test_failed_copy_does_not_win(self):
+        client, hedge = await self.client("slow", "busy")
+        self.assertEqual(await client.service.Echo("a"), "slow")
+        self.assertEqual(self.calls, {"slow": 1, "busy": 1})
+        self.assertEqual((hedge.hedged, hedge.won), (1, 0))
+
+    async def test_copy_answers_failed_original(self):
+        client, hedge = await self.client("slowbusy", "fast")
+        self.assertEqual(await client.service.Echo("a"), "fast")
+        self.assertEqual(hedge.won, 1)
+
+    async def test_both_failed(self):
+        client, hedge = await self.client("slowbusy", "busy")
+        with self.assertRaises(Exception) as context:
+            await client.service.Echo("a")
+        self.assertEqual(context.exception.args[0][0], 503)
+
+    async def test_latency_from_original(self):
+        client, hedge = await self.client("slow", "fast", samples=1)
+        await client.service.Echo("a")
+        self.assertGreaterEqual(hedge.start("Echo"), 0.05)
+
+    async def test_budget(self):
+        client, hedge = await self.client("slow", "fast", budget=1, ratio=0)
+        self.assertEqual(await client.service.Echo("a"), "fast")
+        self.assertEqual(await client.service.Echo("a"), "slow")
+        self.assertEqual((hedge.hedged, hedge.denied), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
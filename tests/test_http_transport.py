@@ -0,0 +1,314 @@
+"""
+HTTP transport tests, run against a local aiohttp server.
+
+"""
+
+import asyncio
+import base64
+import socket
+import unittest
+
+from aiohttp import web
+
+from asyncsuds.transport import Request
+from asyncsuds.transport import TransportError
+from asyncsuds.transport.http_transport import HttpAuthenticated
+from asyncsuds.transport.http_transport import HttpTransport
+from asyncsuds.transport.http_transport import Limiter
+from asyncsuds.transport.http_transport import RetryPolicy
+
+
+class HttpAuthenticatedTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.headers = []
+
+        async def soap(request):
+            self.headers.append(request.headers.get("Authorization"))
+            await request.read()
+            return web.Response(body=b"<reply/>", content_type="text/xml")
+
+        app = web.Application()
+        app.router.add_post("/soap", soap)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = "http://127.0.0.1:%d/soap" % (port,)
+        self.transport = HttpAuthenticated(username="alice", password="secret")
+        self.expected = "Basic " + base64.urlsafe_b64encode(b"alice:secret").decode()
+
+    async def asyncTearDown(self):
+        await self.transport.close()
+        await self.runner.cleanup()
+
+    async def test_send_credentials(self):
+        reply = await self.transport.send(Request(self.url, b"<request/>"))
+        self.assertEqual(reply, b"<reply/>")
+        self.assertEqual(self.headers, [self.expected])
+
+    async def test_stream_credentials(self):
+        chunks = []
+        await self.transport.stream(Request(self.url, b"<request/>"), chunks.append)
+        self.assertEqual(b"".join(chunks), b"<reply/>")
+        self.assertEqual(self.headers, [self.expected])
+
+
+class RetryPolicyTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.calls = 0
+        self.statuses = []
+        self.delay = 0
+        self.drop = False
+
+        async def soap(request):
+            self.calls += 1
+            await request.read()
+            if self.drop:
+                request.transport.close()
+            await asyncio.sleep(self.delay)
+            status = self.statuses.pop(0) if self.statuses else 200
+            return web.Response(status=status, body=b"<reply/>")
+
+        app = web.Application()
+        app.router.add_post("/soap", soap)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = "http://127.0.0.1:%d/soap" % (port,)
+        self.transport = HttpTransport()
+
+    async def asyncTearDown(self):
+        await self.transport.close()
+        await self.runner.cleanup()
+
+    def request(self, retry, idempotent=True, url=None):
+        request = Request(url or self.url, b"<request/>")
+        request.retry = retry
+        request.idempotent = idempotent
+        return request
+
+    async def test_retry_status(self):
+        retry = RetryPolicy(attempts=3, delay=0.001)
+        self.statuses = [503, 502]
+        reply = await self.transport.send(self.request(retry))
+        self.assertEqual(reply, b"<reply/>")
+        self.assertEqual(self.calls, 3)
+        self.assertEqual(retry.retries, 2)
+
+    async def test_attempts_exhausted(self):
+        retry = RetryPolicy(attempts=3, delay=0.001)
+        self.statuses = [503] * 5
+        with self.assertRaises(TransportError) as context:
+            await self.transport.send(self.request(retry))
+        self.assertEqual(context.exception.httpcode, 503)
+        self.assertEqual(self.calls, 3)
+
+    async def test_budget_exhausted_and_refilled(self):
+        retry = RetryPolicy(attempts=3, delay=0.001, budget=2, ratio=0.5)
+        self.statuses = [503] * 4
+        for i in range(2):
+            with self.assertRaises(TransportError):
+                await self.transport.send(self.request(retry))
+        self.assertEqual(self.calls, 4)
+        self.assertEqual(retry.retries, 2)
+        self.assertEqual(retry.denied, 1)
+        self.assertEqual(retry.tokens, 0)
+        for i in range(5):
+            await self.transport.send(self.request(retry))
+        self.assertEqual(retry.tokens, 2)
+        self.statuses = [503]
+        await self.transport.send(self.request(retry))
+        self.assertEqual(retry.retries, 3)
+
+    async def test_streamed_success_refills_budget(self):
+        retry = RetryPolicy(budget=2, ratio=0.5)
+        retry.tokens = 0
+        chunks = []
+        await self.transport.stream(self.request(retry), chunks.append)
+        self.assertEqual(b"".join(chunks), b"<reply/>")
+        self.assertEqual(retry.tokens, 0.5)
+
+    async def test_failure_does_not_refill_budget(self):
+        retry = RetryPolicy(budget=2, ratio=0.5)
+        retry.tokens = 0
+        for status in (503, 404):
+            self.statuses = [status]
+            with self.assertRaises(TransportError):
+                await self.transport.send(self.request(retry, idempotent=False))
+        self.assertEqual(retry.tokens, 0)
+        self.statuses = [500]
+        await self.transport.send(self.request(retry, idempotent=False))
+        self.assertEqual(retry.tokens, 0.5)
+
+    async def test_not_idempotent_not_retried_once_connected(self):
+        retry = RetryPolicy(attempts=3, delay=0.001)
+        self.statuses = [503]
+        with self.assertRaises(TransportError):
+            await self.transport.send(self.request(retry, idempotent=False))
+        self.drop = True
+        with self.assertRaises(Exception):
+            await self.transport.send(self.request(retry, idempotent=False))
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(retry.retries, 0)
+        with self.assertRaises(Exception):
+            await self.transport.send(self.request(retry))
+        self.assertEqual(self.calls, 5)
+
+    async def test_not_idempotent_retried_when_not_connected(self):
+        retry = RetryPolicy(attempts=3, delay=0.001)
+        s = socket.socket()
+        s.bind(("127.0.0.1", 0))
+        url = "http://127.0.0.1:%d/soap" % (s.getsockname()[1],)
+        s.close()
+        with self.assertRaises(Exception):
+            await self.transport.send(self.request(retry, False, url))
+        self.assertEqual(retry.retries, 2)
+
+    async def test_deadline(self):
+        retry = RetryPolicy(attempts=3, delay=0.001, deadline=0.1)
+        self.delay = 1
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with self.assertRaises(asyncio.TimeoutError):
+            await self.transport.send(self.request(retry))
+        self.assertLess(loop.time() - started, 0.5)
+        self.assertEqual(self.calls, 1)
+
+
+class LimiterTest(unittest.IsolatedAsyncioTestCase):
+    async def test_fifo(self):
+        limiter = Limiter(limit_per_host=1)
+        state = await limiter.acquire("a")
+        order = []
+
+        async def waiter(n):
+            state = await limiter.acquire("a")
+            order.append(n)
+            return state
+
+        waiters = [asyncio.ensure_future(waiter(n)) for n in range(3)]
+        await asyncio.sleep(0)
+        self.assertEqual(limiter.stats()["waiting"], 3)
+        for waiter in waiters:
+            limiter.release(state)
+            state = await waiter
+        limiter.release(state)
+        self.assertEqual(order, [0, 1, 2])
+        self.assertEqual(limiter.stats()["active"], 0)
+
+    async def test_host_limits(self):
+        limiter = Limiter(limit=3, limit_per_host=2)
+        a = [await limiter.acquire("a") for i in range(2)]
+        b = await limiter.acquire("b")
+        waiter = asyncio.ensure_future(limiter.acquire("b"))
+        await asyncio.sleep(0)
+        self.assertFalse(waiter.done())
+        limiter.release(a[0])
+        self.assertIs(await waiter, b)
+        self.assertEqual(limiter.stats()["hosts"]["b"]["active"], 2)
+
+    async def test_cancelled_while_waiting(self):
+        limiter = Limiter(limit_per_host=1)
+        state = await limiter.acquire("a")
+        waiter = asyncio.ensure_future(limiter.acquire("a"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        self.assertEqual(limiter.stats()["waiting"], 0)
+        limiter.release(state)
+        self.assertEqual(limiter.stats()["active"], 0)
+
+    async def test_cancelled_after_dispatch(self):
+        limiter = Limiter(limit_per_host=1)
+        state = await limiter.acquire("a")
+        waiter = asyncio.ensure_future(limiter.acquire("a"))
+        await asyncio.sleep(0)
+        limiter.release(state)
+        self.assertEqual(limiter.stats()["active"], 1)
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        self.assertEqual(limiter.stats()["active"], 0)
+        state = await asyncio.wait_for(limiter.acquire("a"), 1)
+        limiter.release(state)
+
+    async def test_adaptive(self):
+        limiter = Limiter(limit_per_host=8, adaptive=True)
+        state = await limiter.acquire("a")
+        limiter.release(state, overloaded=True)
+        self.assertEqual(state.limit, 4)
+        state = await limiter.acquire("a")
+        limiter.release(state, 0.01)
+        self.assertEqual(state.limit, 4.25)
+        for i in range(100):
+            state = await limiter.acquire("a")
+            limiter.release(state, 0.01)
+        self.assertEqual(state.limit, 8)
+
+
+class RequestLimitTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.active = 0
+        self.max_active = 0
+        self.status = 200
+        self.delay = 0.01
+
+        async def soap(request):
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            try:
+                await request.read()
+                await asyncio.sleep(self.delay)
+                return web.Response(status=self.status, body=b"<reply/>")
+            finally:
+                self.active -= 1
+
+        app = web.Application()
+        app.router.add_post("/soap", soap)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.host = "127.0.0.1:%d" % (port,)
+        self.url = "http://%s/soap" % (self.host,)
+
+    async def asyncTearDown(self):
+        await self.runner.cleanup()
+
+    async def test_limit(self):
+        transport = HttpTransport(max_requests_per_host=2)
+        requests = [Request(self.url, b"<request/>") for i in range(6)]
+        replies = await asyncio.gather(*[transport.send(r) for r in requests])
+        self.assertEqual(replies, [b"<reply/>"] * 6)
+        self.assertEqual(self.max_active, 2)
+        stats = transport.requestlimiter().stats()
+        self.assertEqual(stats["requests"], 6)
+        self.assertEqual(stats["active"], 0)
+
+    async def test_overload_lowers_limit(self):
+        transport = HttpTransport(max_requests_per_host=8, adaptive_requests=True)
+        self.status = 503
+        with self.assertRaises(TransportError):
+            await transport.send(Request(self.url, b"<request/>"))
+        hosts = transport.requestlimiter().stats()["hosts"]
+        self.assertEqual(hosts[self.host]["limit"], 4)
+
+    async def test_deadline_lowers_limit(self):
+        transport = HttpTransport(max_requests_per_host=8, adaptive_requests=True)
+        self.delay = 1
+        request = Request(self.url, b"<request/>")
+        request.retry = RetryPolicy(attempts=1, deadline=0.1)
+        with self.assertRaises(asyncio.TimeoutError):
+            await transport.send(request)
+        stats = transport.requestlimiter().stats()
+        self.assertEqual(stats["hosts"][self.host]["limit"], 4)
+        self.assertEqual(stats["active"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()